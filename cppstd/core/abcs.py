@@ -1,5 +1,6 @@
 from abc import (ABC,
                  abstractmethod)
+from copy import copy as _copy
 
 from .hints import Value
 
@@ -20,6 +21,20 @@ class LegacyInputIterator(LegacyIterator):
     def inc(self) -> 'LegacyInputIterator':
         """Increments the iterator."""
 
+    def _advance(self, offset: int) -> None:
+        if offset < 0:
+            raise RuntimeError('Advancing of non-bidirectional iterators '
+                               'by negative offset is undefined.')
+        for _ in range(offset):
+            self.next()
+
+    def _distance_to(self, other: 'LegacyInputIterator') -> int:
+        result, cursor = 0, _copy(self)
+        while cursor != other:
+            cursor.next()
+            result += 1
+        return result
+
 
 class LegacyOutputIterator(LegacyIterator):
     @abstractmethod
@@ -47,6 +62,13 @@ class LegacyBidirectionalIterator(LegacyForwardIterator):
     def prev(self) -> 'LegacyForwardIterator':
         """Returns decremented iterator."""
 
+    def _advance(self, offset: int) -> None:
+        if offset < 0:
+            for _ in range(-offset):
+                self.prev()
+        else:
+            super()._advance(offset)
+
 
 class LegacyRandomAccessIterator(LegacyBidirectionalIterator):
     @abstractmethod
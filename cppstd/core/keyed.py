@@ -0,0 +1,168 @@
+from functools import partial
+from typing import (Any,
+                    Callable,
+                    Iterable,
+                    List,
+                    Optional,
+                    Sequence,
+                    Tuple)
+
+from .hints import (Item,
+                    Key,
+                    Value)
+from .utils import are_sorted_uniquely
+
+KeyFunction = Callable[[Key], Any]
+Compare = Callable[[Key, Key], bool]
+
+
+class ComparisonKey:
+    """
+    Wraps value to be ordered with given less-than predicate
+    like ``Compare`` template parameter of C++ ordered containers.
+    """
+    __slots__ = 'compare', 'value'
+
+    def __init__(self, compare: Compare, value: Key) -> None:
+        self.compare, self.value = compare, value
+
+    def __eq__(self, other: 'ComparisonKey') -> bool:
+        # equivalence, since there is nothing else to rely on
+        return not (self.compare(self.value, other.value)
+                    or self.compare(other.value, self.value))
+
+    def __lt__(self, other: 'ComparisonKey') -> bool:
+        return self.compare(self.value, other.value)
+
+
+class Keyed:
+    """
+    Mixin for trees which are ordered by keys computed with the key function:
+    computed keys take place of the original ones
+    which are stored along with values as items,
+    so each key is computed once instead of on every comparison.
+    Keys taken from tree storages are already computed,
+    so trees pass them to methods of the base class directly
+    (like ``Tree.insert(self, key, item)``) to bypass the key function.
+    """
+    __slots__ = ()
+
+    key_function = None  # type: KeyFunction
+
+    @classmethod
+    def from_components(cls,
+                        keys: Iterable[Key],
+                        values: Optional[Iterable[Value]] = None,
+                        *,
+                        key_function: KeyFunction) -> 'Keyed':
+        keys, items = _to_items(keys, values, key_function)
+        result = super().from_components(keys, items)
+        result.key_function = key_function
+        return result
+
+    @classmethod
+    def join(cls, left: 'Keyed', pivot: Any, right: 'Keyed') -> 'Keyed':
+        key_function = left.key_function
+        result = super().join(left, pivot, right)
+        result.key_function = key_function
+        return result
+
+    @property
+    def items(self) -> List[Item]:
+        return super().values
+
+    @property
+    def keys(self) -> List[Key]:
+        return [key for key, _ in super().values]
+
+    @property
+    def values(self) -> List[Value]:
+        return [value for _, value in super().values]
+
+    def find(self, key: Key) -> Any:
+        return super().find(self.key_function(key))
+
+    def find_many(self, keys: Sequence[Key]) -> List[Any]:
+        return super().find_many(list(map(self.key_function, keys)))
+
+    def insert(self, key: Key, value: Value) -> Tuple[Any, bool]:
+        return super().insert(self.key_function(key), (key, value))
+
+    def insert_hinted(self, hint: Any, key: Key, value: Value
+                      ) -> Tuple[Any, bool]:
+        return super().insert_hinted(hint, self.key_function(key),
+                                     (key, value))
+
+    def insert_or_assign(self, key: Key, value: Value) -> Tuple[Any, bool]:
+        # present key is kept, so the item is rebuilt
+        node, inserted = self.insert(key, value)
+        if not inserted:
+            self.set_value(node, value)
+        return node, inserted
+
+    def lower_bound(self, key: Key) -> Any:
+        return super().lower_bound(self.key_function(key))
+
+    def merge(self,
+              keys: Sequence[Key],
+              values: Optional[Sequence[Value]] = None) -> None:
+        keys, items = _to_items(keys, values, self.key_function)
+        super().merge(keys, items)
+
+    def rank(self, key: Key) -> int:
+        return super().rank(self.key_function(key))
+
+    def set_value(self, node: Any, value: Value) -> None:
+        super().set_value(node, (self.to_key(node), value))
+
+    def split(self, key: Key) -> Tuple['Keyed', Any, 'Keyed']:
+        left, node, right = super().split(self.key_function(key))
+        left.key_function = right.key_function = self.key_function
+        return left, node, right
+
+    def to_item(self, node: Any) -> Item:
+        return super().to_value(node)
+
+    def to_key(self, node: Any) -> Key:
+        return super().to_value(node)[0]
+
+    def to_value(self, node: Any) -> Value:
+        return super().to_value(node)[1]
+
+    def upper_bound(self, key: Key) -> Any:
+        return super().upper_bound(self.key_function(key))
+
+
+def to_key_and_compare(key_function: Optional[KeyFunction]
+                       ) -> Tuple[Optional[KeyFunction], Optional[Compare]]:
+    """Returns key function & compare predicate given one is created from."""
+    return ((None, key_function.args[0])
+            if (isinstance(key_function, partial)
+                and key_function.func is ComparisonKey)
+            else (key_function, None))
+
+
+def to_key_function(key: Optional[KeyFunction],
+                    compare: Optional[Compare]) -> Optional[KeyFunction]:
+    if compare is None:
+        return key
+    elif key is not None:
+        raise ValueError('Key and compare can not be specified together.')
+    return partial(ComparisonKey, compare)
+
+
+def _to_items(keys: Iterable[Key],
+              values: Optional[Iterable[Value]],
+              key_function: KeyFunction) -> Tuple[List[Any], List[Item]]:
+    keys = list(keys)
+    computed_keys = list(map(key_function, keys))
+    if values is None:
+        items = [(key, None) for key in keys]
+        if not are_sorted_uniquely(computed_keys):
+            # the last of equivalent items is kept,
+            # so the order is reversed for the first key to win
+            # like on insertion
+            computed_keys.reverse()
+            items.reverse()
+        return computed_keys, items
+    return computed_keys, list(zip(keys, values))
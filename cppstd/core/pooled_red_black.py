@@ -0,0 +1,813 @@
+import sys
+from array import array
+from bisect import (bisect_left,
+                    bisect_right)
+from itertools import (compress,
+                       repeat)
+from operator import add
+from typing import (Iterable,
+                    Iterator,
+                    List,
+                    Optional,
+                    Sequence,
+                    Tuple)
+
+from .hints import (Item,
+                    Key,
+                    Value)
+from .keyed import Keyed
+from .utils import (are_sorted_uniquely,
+                    should_rebuild,
+                    split_items,
+                    to_balanced_layout,
+                    to_unique_sorted_items,
+                    to_unique_sorted_values)
+
+NIL = None
+# index of the sentinel slot which plays the role of leaves,
+# it should always stay black
+_NIL_INDEX = 0
+_BLACK, _RED = 1, 0
+# maps flags of kept slots to flags of released ones
+_KEPT_TO_RELEASED = bytes([1]) + bytes(255)
+
+Node = int
+AnyNode = Optional[Node]
+
+
+class Tree:
+    """
+    Red-black tree which keeps nodes in flat arrays instead of objects,
+    nodes are referred by indices of their slots.
+    """
+    __slots__ = ('size', 'min', 'max', '_root', '_keys', '_values',
+                 '_lefts', '_rights', '_parents', '_colors', '_sizes',
+                 '_free', '_generations')
+
+    def __init__(self,
+                 keys: List[Key],
+                 values: List[Value],
+                 lefts: array,
+                 rights: array,
+                 parents: array,
+                 colors: bytearray,
+                 sizes: array,
+                 root: int,
+                 size: int) -> None:
+        self._keys, self._values = keys, values
+        self._lefts, self._rights, self._parents, self._colors = (
+            lefts, rights, parents, colors)
+        self._sizes = sizes
+        self._root, self.size = root, size
+        self._free = array('l')
+        # slots are reused, so removals bump their generations
+        # to tell apart handles of removed nodes
+        self._generations = array('Q', [0]) * len(keys)
+        self.min = self.max = NIL
+        if root:
+            node = root
+            while lefts[node]:
+                node = lefts[node]
+            self.min = node
+            node = root
+            while rights[node]:
+                node = rights[node]
+            self.max = node
+
+    def __iter__(self) -> Iterator[Node]:
+        lefts, rights = self._lefts, self._rights
+        node = self._root
+        queue = []
+        while True:
+            while node:
+                queue.append(node)
+                node = lefts[node]
+            if not queue:
+                return
+            node = queue.pop()
+            yield node
+            node = rights[node]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __sizeof__(self) -> int:
+        return (object.__sizeof__(self)
+                + sum(sys.getsizeof(column)
+                      for column in (self._keys, self._values, self._lefts,
+                                     self._rights, self._parents,
+                                     self._colors, self._sizes, self._free,
+                                     self._generations)))
+
+    @classmethod
+    def from_components(cls,
+                        keys: Iterable[Key],
+                        values: Optional[Iterable[Value]] = None
+                        ) -> 'Tree[Key, Value]':
+        keys = list(keys)
+        if not keys:
+            size = 0
+            values = []
+        elif values is None:
+            keys = to_unique_sorted_values(keys)
+            size = len(keys)
+            values = [None] * size
+        elif are_sorted_uniquely(keys):
+            values = list(values)
+            size = len(keys)
+        else:
+            keys, values = split_items(to_unique_sorted_items(keys,
+                                                              tuple(values)))
+            size = len(keys)
+        lefts, rights, parents, sizes = (array('l', [_NIL_INDEX]) * (size + 1)
+                                         for _ in range(4))
+        colors = bytearray([_BLACK]) * (size + 1)
+        # slots are laid out in the keys order
+        root = _link_balanced(range(1, size + 1), lefts, rights, parents,
+                              colors, sizes)
+        return cls([None] + keys, [None] + values, lefts, rights, parents,
+                   colors, sizes, root, size)
+
+    @property
+    def items(self) -> List[Item]:
+        keys, values = self._keys, self._values
+        return [(keys[node], values[node]) for node in self]
+
+    @property
+    def keys(self) -> List[Key]:
+        keys = self._keys
+        return [keys[node] for node in self]
+
+    @property
+    def values(self) -> List[Value]:
+        values = self._values
+        return [values[node] for node in self]
+
+    def clear(self) -> None:
+        # generations outlive slots, so new slots stay distinguishable
+        generations = self._generations
+        for node in self:
+            generations[node] += 1
+        self._keys, self._values = [None], [None]
+        self._lefts, self._rights, self._parents, self._sizes = (
+            array('l', [_NIL_INDEX]) for _ in range(4))
+        self._colors, self._free = bytearray([_BLACK]), array('l')
+        self._root = _NIL_INDEX
+        self.min = self.max = NIL
+        self.size = 0
+
+    def difference(self, other: 'Tree[Key, Value]') -> None:
+        """
+        Removes slots with keys which are present in given tree
+        in ``O(min(m * log(n), n + m))`` time, given tree becomes empty.
+        """
+        if should_rebuild(len(other), self.size):
+            own_nodes, common_nodes, _, _ = self._partition(other)
+            for node in common_nodes:
+                self._release(node)
+            self._relink(own_nodes)
+        else:
+            for node in self._find_nodes(other):
+                if node is not NIL:
+                    self.remove(node)
+        other.clear()
+
+    def find(self, key: Key) -> AnyNode:
+        keys, lefts, rights = self._keys, self._lefts, self._rights
+        node = self._root
+        while node:
+            node_key = keys[node]
+            if key < node_key:
+                node = lefts[node]
+            elif node_key < key:
+                node = rights[node]
+            else:
+                return node
+        return NIL
+
+    def find_many(self, keys: Sequence[Key]) -> List[AnyNode]:
+        """
+        Returns slots with given keys (``NIL`` for absent ones)
+        in the same order by descending with the sorted batch
+        which gets split by the keys of visited slots.
+        """
+        tree_keys, lefts, rights = self._keys, self._lefts, self._rights
+        order = sorted(range(len(keys)),
+                       key=keys.__getitem__)
+        sorted_keys = [keys[index] for index in order]
+        result = [NIL] * len(keys)
+        queue = [(self._root, 0, len(keys))] if keys and self._root else []
+        while queue:
+            node, start, stop = queue.pop()
+            if stop - start == 1:
+                # nothing to share, so usual descent is the cheapest
+                key = sorted_keys[start]
+                while node:
+                    node_key = tree_keys[node]
+                    if key < node_key:
+                        node = lefts[node]
+                    elif node_key < key:
+                        node = rights[node]
+                    else:
+                        result[order[start]] = node
+                        break
+                continue
+            key = tree_keys[node]
+            equal_start = bisect_left(sorted_keys, key, start, stop)
+            equal_stop = bisect_right(sorted_keys, key, equal_start, stop)
+            for position in range(equal_start, equal_stop):
+                result[order[position]] = node
+            if start < equal_start and lefts[node]:
+                queue.append((lefts[node], start, equal_start))
+            if equal_stop < stop and rights[node]:
+                queue.append((rights[node], equal_stop, stop))
+        return result
+
+    def insert(self, key: Key, value: Value) -> Tuple[Node, bool]:
+        keys, lefts, rights = self._keys, self._lefts, self._rights
+        parent, node, is_left_child = _NIL_INDEX, self._root, False
+        while node:
+            parent, node_key = node, keys[node]
+            if key < node_key:
+                node, is_left_child = lefts[node], True
+            elif node_key < key:
+                node, is_left_child = rights[node], False
+            else:
+                return node, False
+        return self._attach(key, value, parent, is_left_child), True
+
+    def insert_hinted(self,
+                      hint: AnyNode,
+                      key: Key,
+                      value: Value) -> Tuple[Node, bool]:
+        """
+        Inserts given key with value as close as possible just prior to hint,
+        takes amortized constant number of comparisons
+        if the key belongs there, falls back to the usual insertion otherwise.
+        """
+        keys = self._keys
+        if hint is NIL:
+            if self.max is not NIL and keys[self.max] < key:
+                return self._attach(key, value, self.max, False), True
+        elif key < keys[hint]:
+            if hint == self.min:
+                return self._attach(key, value, hint, True), True
+            before = self.predecessor(hint)
+            if keys[before] < key:
+                return (self._attach(key, value, before, False)
+                        if not self._rights[before]
+                        else self._attach(key, value, hint, True)), True
+        elif keys[hint] < key:
+            if hint == self.max:
+                return self._attach(key, value, hint, False), True
+            after = self.successor(hint)
+            if key < keys[after]:
+                return (self._attach(key, value, hint, False)
+                        if not self._rights[hint]
+                        else self._attach(key, value, after, True)), True
+        else:
+            return hint, False
+        return Tree.insert(self, key, value)
+
+    def insert_or_assign(self, key: Key, value: Value) -> Tuple[Node, bool]:
+        """
+        Inserts given key with value or assigns the value
+        to the slot with given key in a single descent.
+        """
+        keys, lefts, rights = self._keys, self._lefts, self._rights
+        parent, node, is_left_child = _NIL_INDEX, self._root, False
+        while node:
+            parent, node_key = node, keys[node]
+            if key < node_key:
+                node, is_left_child = lefts[node], True
+            elif node_key < key:
+                node, is_left_child = rights[node], False
+            else:
+                self._values[node] = value
+                return node, False
+        return self._attach(key, value, parent, is_left_child), True
+
+    def intersection(self, other: 'Tree[Key, Value]') -> None:
+        """
+        Removes slots with keys which are not present in given tree
+        in ``O(min(m * log(n), n + m))`` time
+        plus linear-time bulk release of removed slots,
+        given tree becomes empty.
+        """
+        if should_rebuild(len(other), self.size):
+            own_nodes, common_nodes, _, _ = self._partition(other)
+            for node in own_nodes:
+                self._release(node)
+            self._relink(common_nodes)
+        else:
+            self._retain([node
+                          for node in self._find_nodes(other)
+                          if node is not NIL])
+        other.clear()
+
+    def is_alive(self, node: AnyNode, generation: int) -> bool:
+        """Checks if given slot still holds the node of given generation."""
+        return node is NIL or self._generations[node] == generation
+
+    def lower_bound(self, key: Key) -> AnyNode:
+        keys, lefts, rights = self._keys, self._lefts, self._rights
+        result, node = NIL, self._root
+        while node:
+            if keys[node] < key:
+                node = rights[node]
+            else:
+                result, node = node, lefts[node]
+        return result
+
+    def merge(self,
+              keys: Sequence[Key],
+              values: Optional[Sequence[Value]] = None) -> None:
+        """
+        Inserts given keys (with values if any)
+        by relinking merged slots in linear time if keys are sorted,
+        already present slots are kept as they are.
+        """
+        new_items = (zip(to_unique_sorted_values(list(keys)), repeat(None))
+                     if values is None
+                     else iter(to_unique_sorted_items(keys, values)))
+        tree_keys, nodes = self._keys, []
+        old_nodes = iter(self)
+        node, item = next(old_nodes, _NIL_INDEX), next(new_items, None)
+        while node and item is not None:
+            key, value = item
+            node_key = tree_keys[node]
+            if key < node_key:
+                nodes.append(self._allocate(key, value, _NIL_INDEX))
+                item = next(new_items, None)
+            else:
+                if not node_key < key:
+                    item = next(new_items, None)
+                nodes.append(node)
+                node = next(old_nodes, _NIL_INDEX)
+        if node:
+            nodes.append(node)
+            nodes.extend(old_nodes)
+        elif item is not None:
+            nodes.append(self._allocate(*item, _NIL_INDEX))
+            nodes.extend(self._allocate(key, value, _NIL_INDEX)
+                         for key, value in new_items)
+        self._relink(nodes)
+
+    def predecessor(self, node: Node) -> AnyNode:
+        lefts = self._lefts
+        left = lefts[node]
+        if left:
+            rights = self._rights
+            node = left
+            while rights[node]:
+                node = rights[node]
+            return node
+        parents = self._parents
+        parent = parents[node]
+        while parent and node == lefts[parent]:
+            node, parent = parent, parents[parent]
+        return parent or NIL
+
+    def rank(self, key: Key) -> int:
+        keys, lefts, rights, sizes = (self._keys, self._lefts, self._rights,
+                                      self._sizes)
+        result, node = 0, self._root
+        while node:
+            if keys[node] < key:
+                result += sizes[lefts[node]] + 1
+                node = rights[node]
+            else:
+                node = lefts[node]
+        return result
+
+    def remove(self, node: Node) -> None:
+        if node == self.min:
+            self.min = self.successor(node)
+        if node == self.max:
+            self.max = self.predecessor(node)
+        lefts, rights, parents, colors = (self._lefts, self._rights,
+                                          self._parents, self._colors)
+        is_successor_black = colors[node]
+        if not lefts[node]:
+            successor_child = rights[node]
+            self._update_sizes(parents[node], -1)
+            self._transplant(node, successor_child)
+        elif not rights[node]:
+            successor_child = lefts[node]
+            self._update_sizes(parents[node], -1)
+            self._transplant(node, successor_child)
+        else:
+            successor = rights[node]
+            while lefts[successor]:
+                successor = lefts[successor]
+            self._update_sizes(parents[successor], -1)
+            is_successor_black = colors[successor]
+            successor_child = rights[successor]
+            if parents[successor] == node:
+                parents[successor_child] = successor
+            else:
+                self._transplant(successor, successor_child)
+                rights[successor] = rights[node]
+                parents[rights[successor]] = successor
+            self._transplant(node, successor)
+            lefts[successor] = lefts[node]
+            parents[lefts[successor]] = successor
+            colors[successor] = colors[node]
+            self._sizes[successor] = self._sizes[node]
+        if is_successor_black:
+            self._remove_node_fixup(successor_child)
+        # sentinel's parent is used as a scratch during removal
+        parents[_NIL_INDEX] = _NIL_INDEX
+        self._release(node)
+        self.size -= 1
+
+    def remove_range(self, start: AnyNode, stop: AnyNode) -> None:
+        """
+        Removes slots starting from given one up to the stop one
+        in ``O(min(k * log(n), n))`` time.
+        """
+        if start == stop:
+            return
+        elif start == self.min and stop is NIL:
+            self.clear()
+            return
+        start_index, stop_index = self.to_index(start), self.to_index(stop)
+        if should_rebuild(stop_index - start_index, self.size):
+            nodes = list(self)
+            del nodes[start_index:stop_index]
+            self._retain(nodes)
+        else:
+            while start != stop:
+                node, start = start, self.successor(start)
+                self.remove(node)
+
+    def successor(self, node: Node) -> AnyNode:
+        rights = self._rights
+        right = rights[node]
+        if right:
+            lefts = self._lefts
+            node = right
+            while lefts[node]:
+                node = lefts[node]
+            return node
+        parents = self._parents
+        parent = parents[node]
+        while parent and node == rights[parent]:
+            node, parent = parent, parents[parent]
+        return parent or NIL
+
+    def select(self, index: int) -> AnyNode:
+        lefts, rights, sizes = self._lefts, self._rights, self._sizes
+        node = self._root
+        while node:
+            left_size = sizes[lefts[node]]
+            if index < left_size:
+                node = lefts[node]
+            elif index > left_size:
+                index -= left_size + 1
+                node = rights[node]
+            else:
+                return node
+        return NIL
+
+    def set_value(self, node: Node, value: Value) -> None:
+        self._values[node] = value
+
+    def symmetric_difference(self, other: 'Tree[Key, Value]') -> None:
+        """
+        Removes slots with keys which are present in given tree
+        and adds its items with keys which are not present
+        in ``O(min(m * log(n), n + m))`` time, given tree becomes empty.
+        """
+        if should_rebuild(len(other), self.size):
+            own_nodes, common_nodes, other_keys, other_values = (
+                self._partition(other))
+            for node in common_nodes:
+                self._release(node)
+            self._relink(own_nodes)
+            if other_keys:
+                Tree.merge(self, other_keys, other_values)
+        else:
+            other_keys, other_values = other._keys, other._values
+            for other_node in other:
+                key = other_keys[other_node]
+                node = Tree.find(self, key)
+                if node is NIL:
+                    Tree.insert(self, key, other_values[other_node])
+                else:
+                    self.remove(node)
+        other.clear()
+
+    def to_generation(self, node: AnyNode) -> int:
+        return 0 if node is NIL else self._generations[node]
+
+    def to_index(self, node: AnyNode) -> int:
+        if node is NIL:
+            return self.size
+        lefts, rights, parents, sizes = (self._lefts, self._rights,
+                                         self._parents, self._sizes)
+        result = sizes[lefts[node]]
+        parent = parents[node]
+        while parent:
+            if node == rights[parent]:
+                result += sizes[lefts[parent]] + 1
+            node, parent = parent, parents[parent]
+        return result
+
+    def to_item(self, node: Node) -> Item:
+        return self._keys[node], self._values[node]
+
+    def to_key(self, node: Node) -> Key:
+        return self._keys[node]
+
+    def to_value(self, node: Node) -> Value:
+        return self._values[node]
+
+    def union(self, other: 'Tree[Key, Value]') -> None:
+        """
+        Adds items of given tree with keys which are not present
+        in ``O(min(m * log(n), n + m))`` time, given tree becomes empty.
+        """
+        other_keys, other_values = other._keys, other._values
+        if should_rebuild(len(other), self.size):
+            other_nodes = list(other)
+            Tree.merge(self, [other_keys[node] for node in other_nodes],
+                       [other_values[node] for node in other_nodes])
+        else:
+            for other_node in other:
+                Tree.insert(self, other_keys[other_node],
+                            other_values[other_node])
+        other.clear()
+
+    def upper_bound(self, key: Key) -> AnyNode:
+        keys, lefts, rights = self._keys, self._lefts, self._rights
+        result, node = NIL, self._root
+        while node:
+            if key < keys[node]:
+                result, node = node, lefts[node]
+            else:
+                node = rights[node]
+        return result
+
+    def _allocate(self, key: Key, value: Value, parent: int) -> int:
+        if self._free:
+            node = self._free.pop()
+            self._keys[node], self._values[node] = key, value
+            self._lefts[node] = self._rights[node] = _NIL_INDEX
+            self._parents[node], self._colors[node] = parent, _RED
+            self._sizes[node] = 1
+        else:
+            node = len(self._keys)
+            self._keys.append(key)
+            self._values.append(value)
+            self._lefts.append(_NIL_INDEX)
+            self._rights.append(_NIL_INDEX)
+            self._parents.append(parent)
+            self._colors.append(_RED)
+            self._sizes.append(1)
+            if node == len(self._generations):
+                self._generations.append(0)
+        return node
+
+    def _attach(self,
+                key: Key,
+                value: Value,
+                parent: int,
+                is_left_child: bool) -> int:
+        node = self._allocate(key, value, parent)
+        if not parent:
+            self._root = self.min = self.max = node
+        elif is_left_child:
+            self._lefts[parent] = node
+            if parent == self.min:
+                self.min = node
+        else:
+            self._rights[parent] = node
+            if parent == self.max:
+                self.max = node
+        self._update_sizes(parent, 1)
+        self._restore(node)
+        self.size += 1
+        return node
+
+    def _find_nodes(self, other: 'Tree[Key, Value]') -> List[AnyNode]:
+        other_keys = other._keys
+        return [Tree.find(self, other_keys[other_node])
+                for other_node in other]
+
+    def _partition(self, other: 'Tree[Key, Value]'
+                   ) -> Tuple[List[int], List[int], List[Key], List[Value]]:
+        # splits slots into ones with keys which are absent in given tree
+        # and ones with keys which are present in it,
+        # also collects keys & values of given tree with absent keys
+        keys, other_tree_keys, other_tree_values = (self._keys, other._keys,
+                                                    other._values)
+        own_nodes, common_nodes, other_keys, other_values = [], [], [], []
+        nodes, other_nodes = iter(self), iter(other)
+        node, other_node = next(nodes, _NIL_INDEX), next(other_nodes, NIL)
+        while node and other_node is not NIL:
+            key, other_key = keys[node], other_tree_keys[other_node]
+            if key < other_key:
+                own_nodes.append(node)
+                node = next(nodes, _NIL_INDEX)
+            elif other_key < key:
+                other_keys.append(other_key)
+                other_values.append(other_tree_values[other_node])
+                other_node = next(other_nodes, NIL)
+            else:
+                common_nodes.append(node)
+                node = next(nodes, _NIL_INDEX)
+                other_node = next(other_nodes, NIL)
+        if node:
+            own_nodes.append(node)
+            own_nodes.extend(nodes)
+        if other_node is not NIL:
+            other_keys.append(other_tree_keys[other_node])
+            other_values.append(other_tree_values[other_node])
+            for other_node in other_nodes:
+                other_keys.append(other_tree_keys[other_node])
+                other_values.append(other_tree_values[other_node])
+        return own_nodes, common_nodes, other_keys, other_values
+
+    def _relink(self, nodes: List[int]) -> None:
+        self._root = _link_balanced(nodes, self._lefts, self._rights,
+                                    self._parents, self._colors, self._sizes)
+        self.size = len(nodes)
+        self.min, self.max = ((nodes[0], nodes[-1])
+                              if nodes
+                              else (NIL, NIL))
+
+    def _release(self, node: int) -> None:
+        self._keys[node] = self._values[node] = None
+        self._lefts[node] = self._rights[node] = _NIL_INDEX
+        self._parents[node] = self._sizes[node] = _NIL_INDEX
+        self._generations[node] += 1
+        self._free.append(node)
+
+    def _retain(self, nodes: List[int]) -> None:
+        # releases all slots except given sorted ones in bulk,
+        # so the cost of visiting the rest slots one by one is avoided
+        size = len(self._keys)
+        keys, values, old_keys, old_values = ([None] * size, [None] * size,
+                                              self._keys, self._values)
+        are_kept = bytearray(size)
+        are_kept[_NIL_INDEX] = True
+        for node in nodes:
+            keys[node], values[node] = old_keys[node], old_values[node]
+            are_kept[node] = True
+        generations = self._generations = array(
+                'Q', map(add, self._generations, repeat(1)))
+        for node in nodes:
+            generations[node] -= 1
+        self._keys, self._values = keys, values
+        are_released = are_kept.translate(_KEPT_TO_RELEASED)
+        self._free = array('l', compress(range(size), are_released))
+        self._relink(nodes)
+
+    def _remove_node_fixup(self, node: int) -> None:
+        lefts, rights, parents, colors = (self._lefts, self._rights,
+                                          self._parents, self._colors)
+        while node != self._root and colors[node]:
+            parent = parents[node]
+            if node == lefts[parent]:
+                sibling = rights[parent]
+                if not colors[sibling]:
+                    colors[sibling], colors[parent] = _BLACK, _RED
+                    self._rotate_left(parent)
+                    sibling = rights[parent]
+                if colors[lefts[sibling]] and colors[rights[sibling]]:
+                    colors[sibling] = _RED
+                    node = parent
+                else:
+                    if colors[rights[sibling]]:
+                        colors[lefts[sibling]], colors[sibling] = _BLACK, _RED
+                        self._rotate_right(sibling)
+                        sibling = rights[parent]
+                    colors[sibling], colors[parent] = colors[parent], _BLACK
+                    colors[rights[sibling]] = _BLACK
+                    self._rotate_left(parent)
+                    node = self._root
+            else:
+                sibling = lefts[parent]
+                if not colors[sibling]:
+                    colors[sibling], colors[parent] = _BLACK, _RED
+                    self._rotate_right(parent)
+                    sibling = lefts[parent]
+                if colors[lefts[sibling]] and colors[rights[sibling]]:
+                    colors[sibling] = _RED
+                    node = parent
+                else:
+                    if colors[lefts[sibling]]:
+                        colors[rights[sibling]], colors[sibling] = _BLACK, _RED
+                        self._rotate_left(sibling)
+                        sibling = lefts[parent]
+                    colors[sibling], colors[parent] = colors[parent], _BLACK
+                    colors[lefts[sibling]] = _BLACK
+                    self._rotate_right(parent)
+                    node = self._root
+        colors[node] = _BLACK
+
+    def _restore(self, node: int) -> None:
+        lefts, rights, parents, colors = (self._lefts, self._rights,
+                                          self._parents, self._colors)
+        while not colors[parents[node]]:
+            parent = parents[node]
+            grandparent = parents[parent]
+            if parent == lefts[grandparent]:
+                uncle = rights[grandparent]
+                if colors[uncle]:
+                    if node == rights[parent]:
+                        self._rotate_left(parent)
+                        node, parent = parent, node
+                    colors[parent], colors[grandparent] = _BLACK, _RED
+                    self._rotate_right(grandparent)
+                else:
+                    colors[parent] = colors[uncle] = _BLACK
+                    colors[grandparent] = _RED
+                    node = grandparent
+            else:
+                uncle = lefts[grandparent]
+                if colors[uncle]:
+                    if node == lefts[parent]:
+                        self._rotate_right(parent)
+                        node, parent = parent, node
+                    colors[parent], colors[grandparent] = _BLACK, _RED
+                    self._rotate_left(grandparent)
+                else:
+                    colors[parent] = colors[uncle] = _BLACK
+                    colors[grandparent] = _RED
+                    node = grandparent
+        colors[self._root] = _BLACK
+
+    def _rotate_left(self, node: int) -> None:
+        lefts, rights, parents = self._lefts, self._rights, self._parents
+        replacement = rights[node]
+        self._transplant(node, replacement)
+        child = rights[node] = lefts[replacement]
+        if child:
+            parents[child] = node
+        lefts[replacement], parents[node] = node, replacement
+        sizes = self._sizes
+        sizes[replacement] = sizes[node]
+        sizes[node] = sizes[lefts[node]] + sizes[child] + 1
+
+    def _rotate_right(self, node: int) -> None:
+        lefts, rights, parents = self._lefts, self._rights, self._parents
+        replacement = lefts[node]
+        self._transplant(node, replacement)
+        child = lefts[node] = rights[replacement]
+        if child:
+            parents[child] = node
+        rights[replacement], parents[node] = node, replacement
+        sizes = self._sizes
+        sizes[replacement] = sizes[node]
+        sizes[node] = sizes[child] + sizes[rights[node]] + 1
+
+    def _transplant(self, origin: int, replacement: int) -> None:
+        parent = self._parents[origin]
+        if not parent:
+            self._root = replacement
+        elif origin == self._lefts[parent]:
+            self._lefts[parent] = replacement
+        else:
+            self._rights[parent] = replacement
+        # sentinel gets its parent assigned too,
+        # removal fixup relies on it
+        self._parents[replacement] = parent
+
+    def _update_sizes(self, node: int, delta: int) -> None:
+        parents, sizes = self._parents, self._sizes
+        while node:
+            sizes[node] += delta
+            node = parents[node]
+
+
+class KeyedTree(Keyed, Tree):
+    __slots__ = 'key_function',
+
+
+def _link_balanced(nodes: Sequence[int],
+                   lefts: array,
+                   rights: array,
+                   parents: array,
+                   colors: bytearray,
+                   sizes: array) -> int:
+    if not nodes:
+        return _NIL_INDEX
+    for index, left_index, right_index, size, is_black in to_balanced_layout(
+            len(nodes)):
+        node = nodes[index]
+        colors[node], sizes[node] = is_black, size
+        if left_index is None:
+            lefts[node] = _NIL_INDEX
+        else:
+            lefts[node] = left = nodes[left_index]
+            parents[left] = node
+        if right_index is None:
+            rights[node] = _NIL_INDEX
+        else:
+            rights[node] = right = nodes[right_index]
+            parents[right] = node
+    root = nodes[len(nodes) // 2]
+    parents[root] = _NIL_INDEX
+    return root
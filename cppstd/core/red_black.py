@@ -1,10 +1,15 @@
+import sys
+from abc import abstractmethod
+from bisect import (bisect_left,
+                    bisect_right)
+from itertools import repeat
 from reprlib import recursive_repr
 from typing import (Any,
-                    Callable,
                     Iterable,
                     Iterator,
                     List,
                     Optional,
+                    Sequence,
                     Tuple,
                     Union)
 
@@ -14,10 +19,8 @@ from .abcs import LegacyBidirectionalIterator
 from .hints import (Item,
                     Key,
                     Value)
-from .tokenization import WeakToken
-from .utils import (dereference_maybe,
-                    floor_log2 as to_balanced_tree_height,
-                    maybe_weakref,
+from .keyed import Keyed
+from .utils import (to_balanced_layout,
                     to_unique_sorted_items,
                     to_unique_sorted_values)
 
@@ -25,8 +28,7 @@ NIL = None
 
 
 class Node:
-    __slots__ = ('_key', 'value', 'is_black', '_parent', '_left', '_right',
-                 '__weakref__')
+    __slots__ = 'key', 'value', 'is_black', 'parent', 'left', 'right', 'size'
 
     def __init__(self,
                  key: Key,
@@ -35,66 +37,58 @@ class Node:
                  left: Union[NIL, 'Node'] = NIL,
                  right: Union[NIL, 'Node'] = NIL,
                  parent: Union[NIL, 'Node'] = NIL) -> None:
-        self._key, self.value, self.is_black = key, value, is_black
-        self.left, self.right, self._parent = left, right, parent
+        self.key, self.value, self.is_black = key, value, is_black
+        self.left, self.right, self.parent = left, right, parent
+        self.size = 1
+        if left is not NIL:
+            left.parent = self
+            self.size += left.size
+        if right is not NIL:
+            right.parent = self
+            self.size += right.size
 
     __repr__ = recursive_repr()(generate_repr(__init__))
 
-    State = Tuple[Any, ...]
-
-    def __getstate__(self) -> State:
-        return (self._key, self.value, self.is_black,
-                self.parent, self._left, self._right)
-
-    def __setstate__(self, state: State) -> None:
-        (self._key, self.value, self.is_black,
-         self.parent, self._left, self._right) = state
-
     @classmethod
     def from_simple(cls, key: Key, *args: Any) -> 'Node':
         return cls(key, None, *args)
 
     @property
     def item(self) -> Item:
-        return self._key, self.value
+        return self.key, self.value
 
-    @property
-    def key(self) -> Key:
-        return self._key
+    def release(self) -> None:
+        # discarded nodes should refer to no other nodes,
+        # so they are freed without the collector
+        self.parent = self.left = self.right = NIL
 
-    @property
-    def left(self) -> Union[NIL, 'Node']:
-        return self._left
 
-    @left.setter
-    def left(self, node: Union[NIL, 'Node']) -> None:
-        self._left = node
-        _set_parent(node, self)
-
-    @property
-    def parent(self) -> Optional['Node']:
-        return dereference_maybe(self._parent)
-
-    @parent.setter
-    def parent(self, node: Optional['Node']) -> None:
-        self._parent = maybe_weakref(node)
+AnyNode = Union[NIL, Node]
 
-    @property
-    def right(self) -> Union[NIL, 'Node']:
-        return self._right
 
-    @right.setter
-    def right(self, node: Union[NIL, 'Node']) -> None:
-        self._right = node
-        _set_parent(node, self)
+class ThreadedNode(Node):
+    __slots__ = 'prev', 'next'
 
+    def __init__(self,
+                 key: Key,
+                 value: Value,
+                 is_black: bool,
+                 left: Union[NIL, 'ThreadedNode'] = NIL,
+                 right: Union[NIL, 'ThreadedNode'] = NIL,
+                 parent: Union[NIL, 'ThreadedNode'] = NIL) -> None:
+        super().__init__(key, value, is_black, left, right, parent)
+        self.prev = self.next = NIL
 
-AnyNode = Union[NIL, Node]
+    def release(self) -> None:
+        super().release()
+        self.prev = self.next = NIL
 
 
 class Tree:
     __slots__ = 'root', 'size', 'min', 'max'
 
+    _node_cls = Node
+
     def __init__(self,
                  root: AnyNode,
                  size: int,
@@ -107,6 +101,9 @@ class Tree:
 
     __repr__ = generate_repr(__init__)
 
+    def __del__(self) -> None:
+        self.clear()
+
     def __iter__(self) -> Iterator[Node]:
         node = self.root
         queue = []
@@ -123,6 +120,9 @@ class Tree:
     def __len__(self) -> int:
         return self.size
 
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sum(map(sys.getsizeof, self))
+
     @staticmethod
     def predecessor(node: Node) -> Node:
         if node.left is NIL:
@@ -154,70 +154,35 @@ class Tree:
                         ) -> 'Tree[Key, Value]':
         keys = list(keys)
         if not keys:
-            root = min_node = max_node = NIL
-            size = 0
+            nodes = []
         elif values is None:
-            keys = to_unique_sorted_values(keys)
-            size = len(keys)
-            min_node = max_node = NIL
-
-            def to_node(start_index: int,
-                        end_index: int,
-                        depth: int,
-                        height: int = to_balanced_tree_height(size),
-                        max_index: int = size - 1,
-                        constructor: Callable[..., Node] = Node.from_simple
-                        ) -> Node:
-                middle_index = (start_index + end_index) // 2
-                result = constructor(
-                        keys[middle_index], depth != height,
-                        (to_node(start_index, middle_index, depth + 1)
-                         if middle_index > start_index
-                         else NIL),
-                        (to_node(middle_index + 1, end_index, depth + 1)
-                         if middle_index < end_index - 1
-                         else NIL))
-                if not middle_index:
-                    nonlocal min_node
-                    min_node = result
-                if middle_index == max_index:
-                    nonlocal max_node
-                    max_node = result
-                return result
-
-            root = to_node(0, size, 0)
-            root.is_black = True
+            nodes = [cls._node_cls(key, None, True)
+                     for key in to_unique_sorted_values(keys)]
         else:
-            items = to_unique_sorted_items(keys, tuple(values))
-            size = len(items)
-            min_node = max_node = NIL
-
-            def to_node(start_index: int,
-                        end_index: int,
-                        depth: int,
-                        height: int = to_balanced_tree_height(size),
-                        max_index: int = size - 1,
-                        constructor: Callable[..., Node] = Node) -> Node:
-                middle_index = (start_index + end_index) // 2
-                result = constructor(
-                        *items[middle_index], depth != height,
-                        (to_node(start_index, middle_index, depth + 1)
-                         if middle_index > start_index
-                         else NIL),
-                        (to_node(middle_index + 1, end_index, depth + 1)
-                         if middle_index < end_index - 1
-                         else NIL))
-                if not middle_index:
-                    nonlocal min_node
-                    min_node = result
-                if middle_index == max_index:
-                    nonlocal max_node
-                    max_node = result
-                return result
-
-            root = to_node(0, size, 0)
-            root.is_black = True
-        return cls(root, size, min_node, max_node)
+            nodes = [cls._node_cls(key, value, True)
+                     for key, value in to_unique_sorted_items(keys,
+                                                              tuple(values))]
+        return cls(_link_balanced(nodes), len(nodes),
+                   nodes[0] if nodes else NIL,
+                   nodes[-1] if nodes else NIL)
+
+    @classmethod
+    def join(cls,
+             left: 'Tree[Key, Value]',
+             pivot: Node,
+             right: 'Tree[Key, Value]') -> 'Tree[Key, Value]':
+        """
+        Joins trees with keys which are less and greater than the key
+        of given detached pivot node respectively in logarithmic time,
+        given trees become empty.
+        """
+        root, _ = _join(left.root, _to_black_height(left.root), pivot,
+                        right.root, _to_black_height(right.root))
+        left._set_root(NIL)
+        right._set_root(NIL)
+        result = cls(NIL, 0, NIL, NIL)
+        result._set_root(root)
+        return result
 
     @property
     def items(self) -> List[Value]:
@@ -227,10 +192,28 @@ class Tree:
     def keys(self) -> List[Value]:
         return [node.key for node in self]
 
+    @property
+    def values(self) -> List[Value]:
+        return [node.value for node in self]
+
     def clear(self) -> None:
+        # nodes hold strong references to their parents,
+        # so we break the cycles to let them be freed without the collector
+        for node in self:
+            node.parent = NIL
         self.root = self.min = self.max = NIL
         self.size = 0
 
+    def difference(self, other: 'Tree[Key, Value]') -> None:
+        """
+        Removes nodes with keys which are present in given tree
+        in ``O(m * log(n / m + 1))`` time, given tree becomes empty.
+        """
+        root, _ = _difference(self.root, _to_black_height(self.root),
+                              other.root, _to_black_height(other.root))
+        other._set_root(NIL)
+        self._set_root(root)
+
     def find(self, key: Key) -> AnyNode:
         node = self.root
         while node is not NIL:
@@ -242,36 +225,194 @@ class Tree:
                 break
         return node
 
+    def find_many(self, keys: Sequence[Key]) -> List[AnyNode]:
+        """
+        Returns nodes with given keys (``NIL`` for absent ones)
+        in the same order by descending with the sorted batch
+        which gets split by the keys of visited nodes.
+        """
+        order = sorted(range(len(keys)),
+                       key=keys.__getitem__)
+        sorted_keys = [keys[index] for index in order]
+        result = [NIL] * len(keys)
+        queue = [(self.root, 0, len(keys))] if keys and self.root else []
+        while queue:
+            node, start, stop = queue.pop()
+            if stop - start == 1:
+                # nothing to share, so usual descent is the cheapest
+                key = sorted_keys[start]
+                while node is not NIL:
+                    if key < node.key:
+                        node = node.left
+                    elif node.key < key:
+                        node = node.right
+                    else:
+                        result[order[start]] = node
+                        break
+                continue
+            key = node.key
+            equal_start = bisect_left(sorted_keys, key, start, stop)
+            equal_stop = bisect_right(sorted_keys, key, equal_start, stop)
+            for position in range(equal_start, equal_stop):
+                result[order[position]] = node
+            if start < equal_start and node.left is not NIL:
+                queue.append((node.left, start, equal_start))
+            if equal_stop < stop and node.right is not NIL:
+                queue.append((node.right, equal_stop, stop))
+        return result
+
     def insert(self, key: Key, value: Value) -> Tuple[Node, bool]:
         parent = self.root
         if parent is NIL:
-            node = self.root = self.min = self.max = Node(key, value, True)
+            node = self.root = self.min = self.max = self._node_cls(
+                    key, value, True)
             self.size = 1
             return node, True
         while True:
             if key < parent.key:
                 if parent.left is NIL:
-                    node = Node(key, value, False)
-                    parent.left = node
-                    break
+                    return self._attach(key, value, parent, True), True
                 else:
                     parent = parent.left
             elif parent.key < key:
                 if parent.right is NIL:
-                    node = Node(key, value, False)
-                    parent.right = node
-                    break
+                    return self._attach(key, value, parent, False), True
                 else:
                     parent = parent.right
             else:
                 return parent, False
-        self._restore(node)
-        self.size += 1
-        if key < self.min.key:
-            self.min = node
-        elif self.max.key < key:
-            self.max = node
-        return node, True
+
+    def insert_hinted(self,
+                      hint: AnyNode,
+                      key: Key,
+                      value: Value) -> Tuple[Node, bool]:
+        """
+        Inserts given key with value as close as possible just prior to hint,
+        takes amortized constant number of comparisons
+        if the key belongs there, falls back to the usual insertion otherwise.
+        """
+        if hint is NIL:
+            if self.max is not NIL and self.max.key < key:
+                return self._attach(key, value, self.max, False), True
+        elif key < hint.key:
+            if hint is self.min:
+                return self._attach(key, value, hint, True), True
+            before = self.predecessor(hint)
+            if before.key < key:
+                return (self._attach(key, value, before, False)
+                        if before.right is NIL
+                        else self._attach(key, value, hint, True)), True
+        elif hint.key < key:
+            if hint is self.max:
+                return self._attach(key, value, hint, False), True
+            after = self.successor(hint)
+            if key < after.key:
+                return (self._attach(key, value, hint, False)
+                        if hint.right is NIL
+                        else self._attach(key, value, after, True)), True
+        else:
+            return hint, False
+        return Tree.insert(self, key, value)
+
+    def insert_or_assign(self, key: Key, value: Value) -> Tuple[Node, bool]:
+        """
+        Inserts given key with value or assigns the value
+        to the node with given key in a single descent.
+        """
+        node = self.root
+        if node is NIL:
+            return self.insert(key, value)
+        while True:
+            if key < node.key:
+                child = node.left
+                if child is NIL:
+                    return self._attach(key, value, node, True), True
+            elif node.key < key:
+                child = node.right
+                if child is NIL:
+                    return self._attach(key, value, node, False), True
+            else:
+                node.value = value
+                return node, False
+            node = child
+
+    def intersection(self, other: 'Tree[Key, Value]') -> None:
+        """
+        Removes nodes with keys which are not present in given tree
+        in ``O(m * log(n / m + 1) + k)`` time,
+        where ``k`` is the number of removed nodes
+        since they are released to be freed without the collector,
+        given tree becomes empty.
+        """
+        root, _ = _intersection(self.root, _to_black_height(self.root),
+                                other.root, _to_black_height(other.root))
+        other._set_root(NIL)
+        self._set_root(root)
+
+    def is_alive(self, node: AnyNode, generation: int) -> bool:
+        """
+        Checks if given node is still in the tree,
+        removed nodes are detached from their parents.
+        """
+        return node is NIL or node.parent is not NIL or node is self.root
+
+    def lower_bound(self, key: Key) -> AnyNode:
+        result, node = NIL, self.root
+        while node is not NIL:
+            if node.key < key:
+                node = node.right
+            else:
+                result, node = node, node.left
+        return result
+
+    def merge(self,
+              keys: Sequence[Key],
+              values: Optional[Sequence[Value]] = None) -> None:
+        """
+        Inserts given keys (with values if any)
+        by rebuilding the tree from merged nodes
+        in linear time if keys are sorted,
+        already present nodes are kept as they are.
+        """
+        new_items = (zip(to_unique_sorted_values(list(keys)), repeat(None))
+                     if values is None
+                     else iter(to_unique_sorted_items(keys, values)))
+        nodes = []
+        old_nodes = iter(self)
+        node, item = next(old_nodes, NIL), next(new_items, None)
+        while node is not NIL and item is not None:
+            key, value = item
+            if key < node.key:
+                nodes.append(self._node_cls(key, value, True))
+                item = next(new_items, None)
+            else:
+                if not node.key < key:
+                    item = next(new_items, None)
+                nodes.append(node)
+                node = next(old_nodes, NIL)
+        if node is not NIL:
+            nodes.append(node)
+            nodes.extend(old_nodes)
+        elif item is not None:
+            node_cls = self._node_cls
+            nodes.append(node_cls(*item, True))
+            nodes.extend(node_cls(key, value, True)
+                         for key, value in new_items)
+        self.root = _link_balanced(nodes)
+        self.size = len(nodes)
+        self.min, self.max = ((nodes[0], nodes[-1])
+                              if nodes
+                              else (NIL, NIL))
+
+    def rank(self, key: Key) -> int:
+        result, node = 0, self.root
+        while node is not NIL:
+            if node.key < key:
+                result += _to_size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return result
 
     def remove(self, node: Node) -> None:
         if node is self.min:
@@ -283,16 +424,19 @@ class Tree:
             (successor_child, successor_child_parent,
              is_successor_child_left) = (successor.right, successor.parent,
                                          _is_left_child(successor))
+            _decrease_sizes(successor_child_parent)
             self._transplant(successor, successor_child)
         elif successor.right is NIL:
             (successor_child, successor_child_parent,
              is_successor_child_left) = (successor.left, successor.parent,
                                          _is_left_child(successor))
+            _decrease_sizes(successor_child_parent)
             self._transplant(successor, successor_child)
         else:
             successor = node.right
             while successor.left is not NIL:
                 successor = successor.left
+            _decrease_sizes(successor.parent)
             is_node_black = successor.is_black
             successor_child, is_successor_child_left = successor.right, False
             if successor.parent is node:
@@ -302,42 +446,163 @@ class Tree:
                 successor_child_parent = successor.parent
                 self._transplant(successor, successor.right)
                 successor.right = node.right
+                successor.right.parent = successor
             self._transplant(node, successor)
-            successor.left, successor.left.parent = node.left, successor
-            successor.is_black = node.is_black
+            successor.left = node.left
+            successor.left.parent = successor
+            successor.is_black, successor.size = node.is_black, node.size
         if is_node_black:
             self._remove_node_fixup(successor_child, successor_child_parent,
                                     is_successor_child_left)
+        node.parent = node.left = node.right = NIL
         self.size -= 1
 
-    def _restore(self, node: Node) -> None:
-        while not _is_node_black(node.parent):
-            parent = node.parent
-            grandparent = parent.parent
-            if parent is grandparent.left:
-                uncle = grandparent.right
-                if _is_node_black(uncle):
-                    if node is parent.right:
-                        self._rotate_left(parent)
-                        node, parent = parent, node
-                    parent.is_black, grandparent.is_black = True, False
-                    self._rotate_right(grandparent)
-                else:
-                    parent.is_black = uncle.is_black = True
-                    grandparent.is_black = False
-                    node = grandparent
+    def remove_range(self, start: AnyNode, stop: AnyNode) -> None:
+        """
+        Removes nodes starting from given one up to the stop one
+        by splitting the tree around them
+        in ``O(k + log(n))`` time.
+        """
+        if start is stop:
+            return
+        elif start is self.min and stop is NIL:
+            self.clear()
+            return
+        before = self.predecessor(start)
+        left, left_height, _, right, right_height = _split(
+                self.root, _to_black_height(self.root), start.key)
+        if stop is NIL:
+            removed, root = right, left
+        else:
+            removed, _, _, right, right_height = _split(right, right_height,
+                                                        stop.key)
+            root, _ = _join(left, left_height, stop, right, right_height)
+        start.release()
+        if removed is not NIL:
+            _release_subtree(removed)
+        # bounds are known, so there is no need to look for them
+        root.parent, root.is_black = NIL, True
+        self.root, self.size = root, root.size
+        if start is self.min:
+            self.min = stop
+        if stop is NIL:
+            self.max = before
+
+    def select(self, index: int) -> AnyNode:
+        node = self.root
+        while node is not NIL:
+            left_size = _to_size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index > left_size:
+                index -= left_size + 1
+                node = node.right
             else:
-                uncle = grandparent.left
-                if _is_node_black(uncle):
-                    if node is parent.left:
-                        self._rotate_right(parent)
-                        node, parent = parent, node
-                    parent.is_black, grandparent.is_black = True, False
-                    self._rotate_left(grandparent)
-                else:
-                    parent.is_black = uncle.is_black = True
-                    grandparent.is_black = False
-                    node = grandparent
+                break
+        return node
+
+    @staticmethod
+    def set_value(node: Node, value: Value) -> None:
+        node.value = value
+
+    def split(self, key: Key
+              ) -> Tuple['Tree[Key, Value]', AnyNode, 'Tree[Key, Value]']:
+        """
+        Splits tree into trees with keys which are less and greater
+        than given key respectively in logarithmic time,
+        returns them along with detached node with given key if any,
+        the tree becomes empty.
+        """
+        left, _, node, right, _ = _split(self.root,
+                                         _to_black_height(self.root), key)
+        self._set_root(NIL)
+        left_tree, right_tree = (type(self)(NIL, 0, NIL, NIL),
+                                 type(self)(NIL, 0, NIL, NIL))
+        left_tree._set_root(left)
+        right_tree._set_root(right)
+        return left_tree, node, right_tree
+
+    def symmetric_difference(self, other: 'Tree[Key, Value]') -> None:
+        """
+        Removes nodes with keys which are present in given tree
+        and adds its nodes with keys which are not present
+        in ``O(m * log(n / m + 1))`` time, given tree becomes empty.
+        """
+        root, _ = _symmetric_difference(self.root,
+                                        _to_black_height(self.root),
+                                        other.root,
+                                        _to_black_height(other.root))
+        other._set_root(NIL)
+        self._set_root(root)
+
+    @staticmethod
+    def to_generation(node: AnyNode) -> int:
+        # nodes are never reused, so they have no generations
+        return 0
+
+    def to_index(self, node: AnyNode) -> int:
+        if node is NIL:
+            return self.size
+        result = _to_size(node.left)
+        parent = node.parent
+        while parent is not NIL:
+            if node is parent.right:
+                result += _to_size(parent.left) + 1
+            node, parent = parent, parent.parent
+        return result
+
+    @staticmethod
+    def to_item(node: Node) -> Item:
+        return node.item
+
+    @staticmethod
+    def to_key(node: Node) -> Key:
+        return node.key
+
+    @staticmethod
+    def to_value(node: Node) -> Value:
+        return node.value
+
+    def union(self, other: 'Tree[Key, Value]') -> None:
+        """
+        Adds nodes of given tree with keys which are not present
+        in ``O(m * log(n / m + 1))`` time, given tree becomes empty.
+        """
+        root, _ = _union(self.root, _to_black_height(self.root),
+                         other.root, _to_black_height(other.root))
+        other._set_root(NIL)
+        self._set_root(root)
+
+    def upper_bound(self, key: Key) -> AnyNode:
+        result, node = NIL, self.root
+        while node is not NIL:
+            if key < node.key:
+                result, node = node, node.left
+            else:
+                node = node.right
+        return result
+
+    def _attach(self,
+                key: Key,
+                value: Value,
+                parent: Node,
+                is_left_child: bool) -> Node:
+        node = self._node_cls(key, value, False, NIL, NIL, parent)
+        if is_left_child:
+            parent.left = node
+            if parent is self.min:
+                self.min = node
+        else:
+            parent.right = node
+            if parent is self.max:
+                self.max = node
+        _increase_sizes(parent)
+        self._restore(node)
+        self.size += 1
+        return node
+
+    def _restore(self, node: Node) -> None:
+        self.root = _restore(node, self.root)
         self.root.is_black = True
 
     def _remove_node_fixup(self, node: Union[NIL, Node], parent: Node,
@@ -386,49 +651,203 @@ class Tree:
         _set_black(node)
 
     def _rotate_left(self, node: Node) -> None:
-        replacement = node.right
-        self._transplant(node, replacement)
-        node.right, replacement.left = replacement.left, node
+        replacement = _rotate_left(node)
+        if replacement.parent is NIL:
+            self.root = replacement
 
     def _rotate_right(self, node: Node) -> None:
-        replacement = node.left
-        self._transplant(node, replacement)
-        node.left, replacement.right = replacement.right, node
+        replacement = _rotate_right(node)
+        if replacement.parent is NIL:
+            self.root = replacement
+
+    def _set_root(self, root: AnyNode) -> None:
+        # unlike clearing keeps previous nodes intact
+        # since they can be owned by another tree already
+        self.root = root
+        if root is NIL:
+            self.min = self.max = NIL
+            self.size = 0
+            return
+        root.parent, root.is_black = NIL, True
+        self.size = root.size
+        node = root
+        while node.left is not NIL:
+            node = node.left
+        self.min = node
+        node = root
+        while node.right is not NIL:
+            node = node.right
+        self.max = node
 
     def _transplant(self, origin: Node, replacement: Union[NIL, Node]) -> None:
         parent = origin.parent
-        if parent is None:
+        if parent is NIL:
             self.root = replacement
-            _set_parent(replacement, None)
         elif origin is parent.left:
             parent.left = replacement
         else:
             parent.right = replacement
+        if replacement is not NIL:
+            replacement.parent = parent
+
+
+class ThreadedTree(Tree):
+    """
+    Red-black tree which additionally keeps in-order links between nodes,
+    so stepping to the neighbour takes constant time.
+    Links are restored from scratch after splitting & joining,
+    so ``join``, ``split`` and set operations take linear time.
+    """
+    __slots__ = ()
+
+    _node_cls = ThreadedNode
+
+    def __iter__(self) -> Iterator[ThreadedNode]:
+        node = self.min
+        while node is not NIL:
+            yield node
+            node = node.next
+
+    @staticmethod
+    def predecessor(node: ThreadedNode) -> AnyNode:
+        return node.prev
+
+    @staticmethod
+    def successor(node: ThreadedNode) -> AnyNode:
+        return node.next
+
+    @classmethod
+    def from_components(cls,
+                        keys: Iterable[Key],
+                        values: Optional[Iterable[Value]] = None
+                        ) -> 'ThreadedTree[Key, Value]':
+        result = super().from_components(keys, values)
+        _thread(Tree.__iter__(result))
+        return result
+
+    def clear(self) -> None:
+        # base clearing walks the links, so they are broken afterwards
+        node = self.min
+        super().clear()
+        while node is not NIL:
+            node.prev, node.next, node = NIL, NIL, node.next
+
+    def merge(self,
+              keys: Sequence[Key],
+              values: Optional[Sequence[Value]] = None) -> None:
+        super().merge(keys, values)
+        _thread(super().__iter__())
+
+    def remove(self, node: ThreadedNode) -> None:
+        prev, next_ = node.prev, node.next
+        super().remove(node)
+        if prev is not NIL:
+            prev.next = next_
+        if next_ is not NIL:
+            next_.prev = prev
+        node.prev = node.next = NIL
+
+    def remove_range(self, start: AnyNode, stop: AnyNode) -> None:
+        if start is stop:
+            return
+        prev = start.prev
+        # removed nodes are released along with their links
+        super().remove_range(start, stop)
+        if prev is not NIL:
+            prev.next = stop
+        if stop is not NIL:
+            stop.prev = prev
+
+    def _attach(self,
+                key: Key,
+                value: Value,
+                parent: ThreadedNode,
+                is_left_child: bool) -> ThreadedNode:
+        # rotations keep the in-order sequence,
+        # so only the new node should be threaded
+        node = super()._attach(key, value, parent, is_left_child)
+        if is_left_child:
+            prev = node.prev = parent.prev
+            node.next, parent.prev = parent, node
+            if prev is not NIL:
+                prev.next = node
+        else:
+            next_ = node.next = parent.next
+            node.prev, parent.next = parent, node
+            if next_ is not NIL:
+                next_.prev = node
+        return node
+
+    def _set_root(self, root: AnyNode) -> None:
+        # joined subtrees can come from different trees,
+        # so the links are restored from scratch
+        super()._set_root(root)
+        _thread(super().__iter__())
+
+
+class KeyedTree(Keyed, Tree):
+    __slots__ = 'key_function',
+
+
+class KeyedThreadedTree(Keyed, ThreadedTree):
+    __slots__ = 'key_function',
 
 
 class BaseTreeIterator(LegacyBidirectionalIterator):
-    __slots__ = '_node', '_tree', '_token'
+    __slots__ = '_node', '_tree', '_generation'
 
-    def __init__(self,
-                 node: AnyNode,
-                 tree: Tree,
-                 token: WeakToken) -> None:
-        self._node = node
+    def __init__(self, node: AnyNode, tree: Tree) -> None:
         self._tree = tree
-        self._token = token
+        self._set_node(node)
 
     def __eq__(self, other: 'BaseTreeIterator') -> bool:
         return (self._validate_comparison_with(other)
-                or self._to_validated_node() is other._to_validated_node()
+                or self._to_validated_node() == other._to_validated_node()
                 if isinstance(other, type(self))
                 else NotImplemented)
 
+    def _advance(self, offset: int) -> None:
+        position = self._to_position(self._to_validated_node())
+        size = len(self._tree)
+        min_offset, max_offset = -position, size - position
+        if offset < min_offset or offset > max_offset:
+            raise RuntimeError('Advancing of iterators out-of-bound '
+                               'is undefined: '
+                               'offset should be '
+                               'in range({min_offset}, {max_offset}), '
+                               'but found {offset}.'
+                               .format(min_offset=min_offset,
+                                       max_offset=max_offset + 1,
+                                       offset=offset)
+                               if position != size
+                               else 'Advancing of stop iterators '
+                                    'is undefined.')
+        self._set_node(self._from_position(position + offset))
+
+    def _distance_to(self, other: 'BaseTreeIterator') -> int:
+        self._validate_comparison_with(other)
+        return (other._to_position(other._to_validated_node())
+                - self._to_position(self._to_validated_node()))
+
+    @abstractmethod
+    def _from_position(self, position: int) -> AnyNode:
+        """Returns node at given position."""
+
+    def _set_node(self, node: AnyNode) -> None:
+        self._node, self._generation = node, self._tree.to_generation(node)
+
+    @abstractmethod
+    def _to_position(self, node: AnyNode) -> int:
+        """Returns position of given node."""
+
     def _to_validated_node(self) -> AnyNode:
         self._validate()
         return self._node
 
     def _validate(self) -> None:
-        if self._token.expired:
+        # unlike containers' modification counters
+        # this keeps iterators valid until their own node is removed
+        if not self._tree.is_alive(self._node, self._generation):
             raise RuntimeError('Iterator is invalidated.')
 
     def _validate_comparison_with(self, other: 'BaseTreeIterator') -> None:
@@ -440,78 +859,178 @@ class BaseTreeIterator(LegacyBidirectionalIterator):
 class TreeIterator(BaseTreeIterator):
     def dec(self) -> 'TreeIterator':
         node = self._to_validated_node()
-        if node is self._tree.min:
+        if node == self._tree.min:
             raise RuntimeError('Post-decrementing of start iterators '
                                'is undefined.')
-        self._node = (self._tree.max
-                      if node is NIL
-                      else self._tree.predecessor(node))
-        return type(self)(node, self._tree, self._token)
+        self._set_node(self._tree.max
+                       if node is NIL
+                       else self._tree.predecessor(node))
+        return type(self)(node, self._tree)
 
     def inc(self) -> 'TreeIterator':
         node = self._to_validated_node()
         if node is NIL:
             raise RuntimeError('Post-incrementing of stop iterators '
                                'is undefined.')
-        self._node = self._tree.successor(node)
-        return type(self)(node, self._tree, self._token)
+        self._set_node(self._tree.successor(node))
+        return type(self)(node, self._tree)
 
     def next(self) -> 'TreeIterator':
         node = self._to_validated_node()
         if node is NIL:
             raise RuntimeError('Pre-incrementing of stop iterators '
                                'is undefined.')
-        self._node = self._tree.successor(node)
+        self._set_node(self._tree.successor(node))
         return self
 
     def prev(self) -> 'TreeIterator':
         node = self._to_validated_node()
-        if node is self._tree.min:
+        if node == self._tree.min:
             raise RuntimeError('Pre-decrementing of start iterators '
                                'is undefined.')
-        self._node = (self._tree.max
-                      if node is NIL
-                      else self._tree.predecessor(node))
+        self._set_node(self._tree.max
+                       if node is NIL
+                       else self._tree.predecessor(node))
         return self
 
+    def _from_position(self, position: int) -> AnyNode:
+        return self._tree.select(position)
+
+    def _to_position(self, node: AnyNode) -> int:
+        return self._tree.to_index(node)
+
 
 class TreeReverseIterator(BaseTreeIterator):
     def dec(self) -> 'TreeReverseIterator':
         node = self._to_validated_node()
-        if node is self._tree.max:
+        if node == self._tree.max:
             raise RuntimeError('Post-decrementing of start iterators '
                                'is undefined.')
-        self._node = (self._tree.min
-                      if node is NIL
-                      else self._tree.successor(node))
-        return type(self)(node, self._tree, self._token)
+        self._set_node(self._tree.min
+                       if node is NIL
+                       else self._tree.successor(node))
+        return type(self)(node, self._tree)
 
     def inc(self) -> 'TreeReverseIterator':
         node = self._to_validated_node()
         if node is NIL:
             raise RuntimeError('Post-incrementing of stop iterators '
                                'is undefined.')
-        self._node = self._tree.predecessor(node)
-        return type(self)(node, self._tree, self._token)
+        self._set_node(self._tree.predecessor(node))
+        return type(self)(node, self._tree)
 
     def next(self) -> 'TreeReverseIterator':
         node = self._to_validated_node()
         if node is NIL:
             raise RuntimeError('Pre-incrementing of stop iterators '
                                'is undefined.')
-        self._node = self._tree.predecessor(node)
+        self._set_node(self._tree.predecessor(node))
         return self
 
     def prev(self) -> 'TreeReverseIterator':
         node = self._to_validated_node()
-        if node is self._tree.max:
+        if node == self._tree.max:
             raise RuntimeError('Pre-decrementing of start iterators '
                                'is undefined.')
-        self._node = (self._tree.min
-                      if node is NIL
-                      else self._tree.successor(node))
+        self._set_node(self._tree.min
+                       if node is NIL
+                       else self._tree.successor(node))
         return self
 
+    def _from_position(self, position: int) -> AnyNode:
+        size = len(self._tree)
+        return (NIL
+                if position == size
+                else self._tree.select(size - 1 - position))
+
+    def _to_position(self, node: AnyNode) -> int:
+        return (len(self._tree)
+                if node is NIL
+                else len(self._tree) - 1 - self._tree.to_index(node))
+
+
+def _link_balanced(nodes: Sequence[Node]) -> AnyNode:
+    if not nodes:
+        return NIL
+    for index, left_index, right_index, size, is_black in to_balanced_layout(
+            len(nodes)):
+        node = nodes[index]
+        node.is_black, node.size = is_black, size
+        if left_index is None:
+            node.left = NIL
+        else:
+            node.left = left = nodes[left_index]
+            left.parent = node
+        if right_index is None:
+            node.right = NIL
+        else:
+            node.right = right = nodes[right_index]
+            right.parent = node
+    root = nodes[len(nodes) // 2]
+    root.parent = NIL
+    return root
+
+
+def _decrease_sizes(node: AnyNode) -> None:
+    while node is not NIL:
+        node.size -= 1
+        node = node.parent
+
+
+def _difference(first: AnyNode,
+                first_height: int,
+                second: AnyNode,
+                second_height: int) -> Tuple[AnyNode, int]:
+    if first is NIL:
+        if second is not NIL:
+            _release_subtree(second)
+        return NIL, 0
+    elif second is NIL:
+        return first, first_height
+    second_left, second_right, second_child_height = (
+        second.left, second.right, second_height - second.is_black)
+    first_left, first_left_height, node, first_right, first_right_height = (
+        _split(first, first_height, second.key))
+    left, left_height = _difference(first_left, first_left_height,
+                                    second_left, second_child_height)
+    right, right_height = _difference(first_right, first_right_height,
+                                      second_right, second_child_height)
+    second.release()
+    if node is not NIL:
+        node.release()
+    return _join_pair(left, left_height, right, right_height)
+
+
+def _increase_sizes(node: AnyNode) -> None:
+    while node is not NIL:
+        node.size += 1
+        node = node.parent
+
+
+def _intersection(first: AnyNode,
+                  first_height: int,
+                  second: AnyNode,
+                  second_height: int) -> Tuple[AnyNode, int]:
+    if first is NIL:
+        if second is not NIL:
+            _release_subtree(second)
+        return NIL, 0
+    elif second is NIL:
+        _release_subtree(first)
+        return NIL, 0
+    second_left, second_right, second_child_height = (
+        second.left, second.right, second_height - second.is_black)
+    first_left, first_left_height, node, first_right, first_right_height = (
+        _split(first, first_height, second.key))
+    left, left_height = _intersection(first_left, first_left_height,
+                                      second_left, second_child_height)
+    right, right_height = _intersection(first_right, first_right_height,
+                                        second_right, second_child_height)
+    second.release()
+    return (_join_pair(left, left_height, right, right_height)
+            if node is NIL
+            else _join(left, left_height, node, right, right_height))
+
 
 def _is_left_child(node: Node) -> bool:
     parent = node.parent
@@ -522,11 +1041,256 @@ def _is_node_black(node: Union[NIL, Node]) -> bool:
     return node is NIL or node.is_black
 
 
+def _join(left: AnyNode,
+          left_height: int,
+          pivot: Node,
+          right: AnyNode,
+          right_height: int) -> Tuple[Node, int]:
+    # heights are black ones, roots are made black to keep them exact
+    if left is not NIL:
+        left.parent = NIL
+        if not left.is_black:
+            left.is_black, left_height = True, left_height + 1
+    if right is not NIL:
+        right.parent = NIL
+        if not right.is_black:
+            right.is_black, right_height = True, right_height + 1
+    pivot.parent = NIL
+    if left_height == right_height:
+        pivot.is_black = True
+        _set_children(pivot, left, right)
+        return pivot, left_height + 1
+    pivot.is_black = False
+    if left_height > right_height:
+        # pivot replaces the black node of the right spine
+        # which has the same height as the right tree
+        root, height = left, left_height
+        parent, node, node_height, extra_size = (NIL, left, left_height,
+                                                 _to_size(right) + 1)
+        while not (node_height == right_height and _is_node_black(node)):
+            node_height -= node.is_black
+            node.size += extra_size
+            parent, node = node, node.right
+        _set_children(pivot, node, right)
+        parent.right = pivot
+    else:
+        root, height = right, right_height
+        parent, node, node_height, extra_size = (NIL, right, right_height,
+                                                 _to_size(left) + 1)
+        while not (node_height == left_height and _is_node_black(node)):
+            node_height -= node.is_black
+            node.size += extra_size
+            parent, node = node, node.left
+        _set_children(pivot, left, node)
+        parent.left = pivot
+    pivot.parent = parent
+    root = _restore(pivot, root)
+    if not root.is_black:
+        root.is_black, height = True, height + 1
+    return root, height
+
+
+def _join_pair(left: AnyNode,
+               left_height: int,
+               right: AnyNode,
+               right_height: int) -> Tuple[AnyNode, int]:
+    if left is NIL:
+        return right, right_height
+    elif right is NIL:
+        return left, left_height
+    left, left_height, pivot = _split_last(left, left_height)
+    return _join(left, left_height, pivot, right, right_height)
+
+
+def _release_subtree(node: Node) -> None:
+    queue = [node]
+    while queue:
+        node = queue.pop()
+        if node.left is not NIL:
+            queue.append(node.left)
+        if node.right is not NIL:
+            queue.append(node.right)
+        node.release()
+
+
+def _restore(node: Node, root: Node) -> Node:
+    while not _is_node_black(node.parent):
+        parent = node.parent
+        grandparent = parent.parent
+        if parent is grandparent.left:
+            uncle = grandparent.right
+            if _is_node_black(uncle):
+                if node is parent.right:
+                    _rotate_left(parent)
+                    node, parent = parent, node
+                parent.is_black, grandparent.is_black = True, False
+                if _rotate_right(grandparent).parent is NIL:
+                    root = parent
+            else:
+                parent.is_black = uncle.is_black = True
+                grandparent.is_black = False
+                node = grandparent
+        else:
+            uncle = grandparent.left
+            if _is_node_black(uncle):
+                if node is parent.left:
+                    _rotate_right(parent)
+                    node, parent = parent, node
+                parent.is_black, grandparent.is_black = True, False
+                if _rotate_left(grandparent).parent is NIL:
+                    root = parent
+            else:
+                parent.is_black = uncle.is_black = True
+                grandparent.is_black = False
+                node = grandparent
+    return root
+
+
+def _rotate_left(node: Node) -> Node:
+    replacement, parent = node.right, node.parent
+    if parent is not NIL:
+        if node is parent.left:
+            parent.left = replacement
+        else:
+            parent.right = replacement
+    replacement.parent = parent
+    child = node.right = replacement.left
+    if child is not NIL:
+        child.parent = node
+    replacement.left, node.parent = node, replacement
+    replacement.size = node.size
+    node.size = _to_size(node.left) + _to_size(child) + 1
+    return replacement
+
+
+def _rotate_right(node: Node) -> Node:
+    replacement, parent = node.left, node.parent
+    if parent is not NIL:
+        if node is parent.left:
+            parent.left = replacement
+        else:
+            parent.right = replacement
+    replacement.parent = parent
+    child = node.left = replacement.right
+    if child is not NIL:
+        child.parent = node
+    replacement.right, node.parent = node, replacement
+    replacement.size = node.size
+    node.size = _to_size(child) + _to_size(node.right) + 1
+    return replacement
+
+
 def _set_black(maybe_node: Optional[Node]) -> None:
     if maybe_node is not None:
         maybe_node.is_black = True
 
 
-def _set_parent(node: Union[NIL, Node], parent: Optional[Node]) -> None:
-    if node is not NIL:
-        node.parent = parent
+def _set_children(node: Node, left: AnyNode, right: AnyNode) -> None:
+    node.left, node.right = left, right
+    node.size = _to_size(left) + _to_size(right) + 1
+    if left is not NIL:
+        left.parent = node
+    if right is not NIL:
+        right.parent = node
+
+
+def _split(node: AnyNode, height: int, key: Key
+           ) -> Tuple[AnyNode, int, AnyNode, AnyNode, int]:
+    if node is NIL:
+        return NIL, 0, NIL, NIL, 0
+    left, right, child_height = node.left, node.right, height - node.is_black
+    if key < node.key:
+        left, left_height, found, middle, middle_height = _split(
+                left, child_height, key)
+        right, right_height = _join(middle, middle_height, node, right,
+                                    child_height)
+    elif node.key < key:
+        middle, middle_height, found, right, right_height = _split(
+                right, child_height, key)
+        left, left_height = _join(left, child_height, node, middle,
+                                  middle_height)
+    else:
+        # found node can be reused, so only its tree links are dropped
+        node.parent = node.left = node.right = NIL
+        node.size = 1
+        found, left_height, right_height = node, child_height, child_height
+    return left, left_height, found, right, right_height
+
+
+def _split_last(node: Node, height: int) -> Tuple[AnyNode, int, Node]:
+    left, right, child_height = node.left, node.right, height - node.is_black
+    if right is NIL:
+        return left, child_height, node
+    right, right_height, last = _split_last(right, child_height)
+    left, left_height = _join(left, child_height, node, right, right_height)
+    return left, left_height, last
+
+
+def _symmetric_difference(first: AnyNode,
+                          first_height: int,
+                          second: AnyNode,
+                          second_height: int) -> Tuple[AnyNode, int]:
+    if first is NIL:
+        return second, second_height
+    elif second is NIL:
+        return first, first_height
+    second_left, second_right, second_child_height = (
+        second.left, second.right, second_height - second.is_black)
+    first_left, first_left_height, node, first_right, first_right_height = (
+        _split(first, first_height, second.key))
+    left, left_height = _symmetric_difference(
+            first_left, first_left_height, second_left, second_child_height)
+    right, right_height = _symmetric_difference(
+            first_right, first_right_height, second_right,
+            second_child_height)
+    if node is NIL:
+        return _join(left, left_height, second, right, right_height)
+    node.release()
+    second.release()
+    return _join_pair(left, left_height, right, right_height)
+
+
+def _thread(nodes: Iterable[ThreadedNode]) -> None:
+    prev = NIL
+    for node in nodes:
+        node.prev = prev
+        if prev is not NIL:
+            prev.next = node
+        prev = node
+    if prev is not NIL:
+        prev.next = NIL
+
+
+def _to_black_height(node: AnyNode) -> int:
+    result = 0
+    while node is not NIL:
+        result += node.is_black
+        node = node.left
+    return result
+
+
+def _to_size(node: AnyNode) -> int:
+    return 0 if node is NIL else node.size
+
+
+def _union(first: AnyNode,
+           first_height: int,
+           second: AnyNode,
+           second_height: int) -> Tuple[AnyNode, int]:
+    if first is NIL:
+        return second, second_height
+    elif second is NIL:
+        return first, first_height
+    second_left, second_right, second_child_height = (
+        second.left, second.right, second_height - second.is_black)
+    first_left, first_left_height, node, first_right, first_right_height = (
+        _split(first, first_height, second.key))
+    left, left_height = _union(first_left, first_left_height, second_left,
+                               second_child_height)
+    right, right_height = _union(first_right, first_right_height,
+                                 second_right, second_child_height)
+    if node is NIL:
+        node = second
+    else:
+        second.release()
+    return _join(left, left_height, node, right, right_height)
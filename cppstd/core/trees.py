@@ -0,0 +1,190 @@
+import sys
+from typing import (Any,
+                    Iterable,
+                    Iterator,
+                    List,
+                    Optional,
+                    Tuple,
+                    Union)
+
+from . import (pooled_red_black,
+               red_black)
+from .hints import (Key,
+                    Value)
+from .keyed import (Keyed,
+                    KeyFunction)
+from .tokenization import Tokenizer
+
+AnyTree = Union[red_black.Tree, pooled_red_black.Tree]
+AnyNode = Union[red_black.AnyNode, pooled_red_black.AnyNode]
+
+
+def create_tree(keys: Iterable[Key],
+                values: Optional[Iterable[Value]],
+                pooled: bool,
+                threaded: bool,
+                key_function: Optional[KeyFunction]) -> AnyTree:
+    tree_cls = to_tree_cls(pooled, threaded, key_function is not None)
+    return (tree_cls.from_components(keys, values)
+            if key_function is None
+            else tree_cls.from_components(keys, values,
+                                          key_function=key_function))
+
+
+def create_tree_like(tree: AnyTree,
+                     keys: Iterable[Key],
+                     values: Optional[Iterable[Value]]) -> AnyTree:
+    """
+    Creates tree from given components
+    with the same storage and ordering as given tree,
+    since set operations consume their arguments
+    they are passed fresh trees created this way.
+    """
+    return create_tree(keys, values, is_pooled(tree), is_threaded(tree),
+                       to_tree_key_function(tree))
+
+
+def erase(tree: AnyTree,
+          tokenizer: Tokenizer,
+          iterator_cls: type,
+          first_arg: Any,
+          second_arg: Any) -> Any:
+    """
+    Removes nodes by key, position or range of positions
+    like ``erase`` overloads of C++ ordered containers.
+    """
+    if second_arg is not None:
+        start, stop = _to_node(tree, first_arg), _to_node(tree, second_arg)
+        if start != stop:
+            if tree.to_index(start) > tree.to_index(stop):
+                raise RuntimeError('Erasing of ranges '
+                                   'with start after stop is undefined.')
+            tokenizer.reset()
+            tree.remove_range(start, stop)
+        return iterator_cls(stop, tree)
+    elif isinstance(first_arg, iterator_cls):
+        node = _to_node(tree, first_arg)
+        if node is red_black.NIL:
+            raise RuntimeError('Erasing of stop iterators '
+                               'is undefined.')
+        successor = tree.successor(node)
+        tokenizer.reset()
+        tree.remove(node)
+        return iterator_cls(successor, tree)
+    node = tree.find(first_arg)
+    if node is red_black.NIL:
+        return 0
+    tokenizer.reset()
+    tree.remove(node)
+    return 1
+
+
+def intersect(tree: AnyTree, other: AnyTree) -> None:
+    """Removes nodes with keys which are absent in other tree."""
+    if len(tree) > len(other):
+        tree.intersection(create_tree_like(tree, other.keys, None))
+    else:
+        _remove_nodes(tree, [node
+                             for node in tree
+                             if other.find(tree.to_key(node))
+                             is red_black.NIL])
+
+
+def iterate_range(tree: AnyTree,
+                  lo: Optional[Key],
+                  hi: Optional[Key],
+                  inclusive: Tuple[bool, bool],
+                  reverse: bool) -> Iterator[AnyNode]:
+    """
+    Yields nodes of given tree with keys between given bounds
+    (``None`` stands for the absent one) lazily
+    starting from the logarithmic-time search of the first one.
+    """
+    include_lo, include_hi = inclusive
+    start = (tree.min
+             if lo is None
+             else (tree.lower_bound(lo)
+                   if include_lo
+                   else tree.upper_bound(lo)))
+    stop = (red_black.NIL
+            if hi is None
+            else (tree.upper_bound(hi)
+                  if include_hi
+                  else tree.lower_bound(hi)))
+    # bounds are compared by the tree itself,
+    # so ranks are enough to tell how many nodes are in between
+    count = tree.to_index(stop) - tree.to_index(start)
+    if reverse:
+        node, step = (tree.max
+                      if stop is red_black.NIL
+                      else tree.predecessor(stop),
+                      tree.predecessor)
+    else:
+        node, step = start, tree.successor
+    for _ in range(count):
+        yield node
+        node = step(node)
+
+
+def is_pooled(tree: AnyTree) -> bool:
+    return isinstance(tree, pooled_red_black.Tree)
+
+
+def is_threaded(tree: AnyTree) -> bool:
+    return isinstance(tree, red_black.ThreadedTree)
+
+
+def subtract(tree: AnyTree, other: AnyTree) -> None:
+    """Removes nodes with keys which are present in other tree."""
+    if len(tree) > len(other):
+        tree.difference(create_tree_like(tree, other.keys, None))
+    else:
+        _remove_nodes(tree, [node
+                             for node in tree
+                             if other.find(tree.to_key(node))
+                             is not red_black.NIL])
+
+
+def to_bytes_per_element(tree: AnyTree) -> float:
+    return sys.getsizeof(tree) / max(len(tree), 1)
+
+
+def to_equal_range(tree: AnyTree, key: Key) -> Tuple[AnyNode, AnyNode]:
+    # single descent is enough for present keys since they are unique
+    start = tree.find(key)
+    if start is red_black.NIL:
+        start = stop = tree.lower_bound(key)
+    else:
+        stop = tree.successor(start)
+    return start, stop
+
+
+def to_tree_cls(pooled: bool, threaded: bool, keyed: bool) -> type:
+    if pooled:
+        if threaded:
+            raise ValueError('Pooled trees can not be threaded.')
+        return (pooled_red_black.KeyedTree
+                if keyed
+                else pooled_red_black.Tree)
+    elif threaded:
+        return (red_black.KeyedThreadedTree
+                if keyed
+                else red_black.ThreadedTree)
+    return red_black.KeyedTree if keyed else red_black.Tree
+
+
+def to_tree_key_function(tree: AnyTree) -> Optional[KeyFunction]:
+    return tree.key_function if isinstance(tree, Keyed) else None
+
+
+def _remove_nodes(tree: AnyTree, nodes: List[AnyNode]) -> None:
+    # removing in place keeps iterators to the rest of nodes valid
+    for node in nodes:
+        tree.remove(node)
+
+
+def _to_node(tree: AnyTree, iterator: red_black.BaseTreeIterator) -> AnyNode:
+    if iterator._tree is not tree:
+        raise RuntimeError('Using iterators from other collections '
+                           'is undefined.')
+    return iterator._to_validated_node()
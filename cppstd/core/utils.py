@@ -1,15 +1,29 @@
-import weakref
-from itertools import groupby
-from typing import (List, Optional,
+from array import array
+from itertools import (groupby,
+                       islice)
+from operator import lt
+from typing import (Any,
+                    Iterable,
+                    Iterator,
+                    List,
+                    Optional,
                     Sequence,
                     Tuple,
                     TypeVar)
 
+try:
+    from pickle import PickleBuffer
+except ImportError:
+    PickleBuffer = None
+
 from .hints import (Item,
                     Key,
                     Value)
 
 Domain = TypeVar('Domain')
+# rebuilding takes linear time while updating one by one
+# takes logarithmic time per update
+_REBUILDING_SIZE_FACTOR = 4
 
 
 class AntisymmetricKeyIndex:
@@ -26,11 +40,20 @@ def are_keys_equal(left: Key, right: Key) -> bool:
     return not (left < right or right < left)
 
 
-def dereference_maybe(maybe_reference: Optional[weakref.ref]
-                      ) -> Optional[Value]:
-    return (maybe_reference
-            if maybe_reference is None
-            else maybe_reference())
+def are_sorted_uniquely(values: Sequence[Value]) -> bool:
+    """
+    Checks if values are sorted in strictly ascending order
+    in a single linear pass.
+    >>> are_sorted_uniquely([])
+    True
+    >>> are_sorted_uniquely([1, 2, 3])
+    True
+    >>> are_sorted_uniquely([1, 2, 2])
+    False
+    >>> are_sorted_uniquely([2, 1])
+    False
+    """
+    return all(map(lt, values, islice(values, 1, None)))
 
 
 def floor_log2(number: int) -> int:
@@ -53,15 +76,132 @@ def identity(value: Domain) -> Domain:
     return value
 
 
-def maybe_weakref(object_: Optional[Value]
-                  ) -> Optional[weakref.ReferenceType]:
-    return (object_
-            if object_ is None
-            else weakref.ref(object_))
+def should_rebuild(count: int, size: int) -> bool:
+    """
+    Checks if rebuilding of a tree with given size
+    is cheaper than updating it given count of times one by one.
+    >>> should_rebuild(1, 100)
+    False
+    >>> should_rebuild(100, 100)
+    True
+    """
+    return count * floor_log2(size + 1) >= _REBUILDING_SIZE_FACTOR * size
+
+
+def split_items(items: Iterable[Item]) -> Tuple[List[Key], List[Value]]:
+    """
+    Splits items into lists of keys and values in a single pass.
+    >>> split_items([(1, 'a'), (2, 'b')])
+    ([1, 2], ['a', 'b'])
+    """
+    keys, values = [], []
+    for key, value in items:
+        keys.append(key)
+        values.append(value)
+    return keys, values
+
+
+def to_balanced_layout(size: int
+                       ) -> Iterator[Tuple[int, Optional[int], Optional[int],
+                                           int, bool]]:
+    """
+    Yields layout of the balanced red-black tree over positions
+    ``range(size)`` level by level as tuples of position,
+    positions of its children (``None`` for absent ones),
+    size of its subtree and its blackness,
+    the subtree of a positions range is rooted in the middle one.
+    >>> list(to_balanced_layout(3))
+    [(1, 0, 2, 3, True), (0, None, None, 1, False), (2, None, None, 1, False)]
+    """
+    height = floor_log2(size)
+    starts, ends = [0], [size]
+    for depth in range(height + 1):
+        # only the deepest level can be incomplete,
+        # so its nodes are red to keep black heights equal
+        is_black = depth != height or not depth
+        next_starts, next_ends = [], []
+        for start, end in zip(starts, ends):
+            middle = (start + end) // 2
+            if middle > start:
+                left = (start + middle) // 2
+                next_starts.append(start)
+                next_ends.append(middle)
+            else:
+                left = None
+            if middle < end - 1:
+                right = (middle + 1 + end) // 2
+                next_starts.append(middle + 1)
+                next_ends.append(end)
+            else:
+                right = None
+            yield middle, left, right, end - start, is_black
+        starts, ends = next_starts, next_ends
+
+
+def to_buffer(values: array, protocol: int) -> Any:
+    """
+    Returns picklable representation of an array
+    which is passed as an out-of-band buffer for pickle protocol 5+.
+    """
+    return (PickleBuffer(values)
+            if PickleBuffer is not None and protocol >= 5
+            else values)
+
+
+def to_first_mismatch(left: Iterable[Domain], right: Iterable[Domain]
+                      ) -> Optional[Tuple[Domain, Domain]]:
+    """
+    Returns first pair of non-equal values at the same positions
+    or ``None`` if the shortest iterable is exhausted without mismatches.
+    >>> to_first_mismatch([1, 2, 3], [1, 2, 4])
+    (3, 4)
+    >>> to_first_mismatch([1, 2], [1, 2, 3]) is None
+    True
+    """
+    for left_value, right_value in zip(left, right):
+        if not left_value == right_value:
+            return left_value, right_value
+    return None
+
+
+def to_normalized_index(index: int, size: int) -> int:
+    if not -size <= index < size:
+        raise IndexError('Index should be in range({min_index}, {size}), '
+                         'but found {index}.'
+                         .format(min_index=-size,
+                                 size=size,
+                                 index=index))
+    return index % size
+
+
+def to_packed_values(values: List[Value], protocol: int) -> Any:
+    """
+    Returns compact picklable representation of values,
+    machine integers are packed into an array
+    which is passed as an out-of-band buffer for pickle protocol 5+.
+    """
+    if values and all(type(value) is int for value in values):
+        try:
+            packed = array('q', values)
+        except OverflowError:
+            return values
+        return to_buffer(packed, protocol)
+    return values
+
+
+def to_unpacked_values(packed: Any, typecode: str = 'q') -> Sequence[Value]:
+    if isinstance(packed, (list, array)):
+        return packed
+    # raw buffer of machine values
+    result = array(typecode)
+    result.frombytes(memoryview(packed).cast('B'))
+    return result
 
 
 def to_unique_sorted_items(keys: Sequence[Key], values: Sequence[Value]
                            ) -> List[Item]:
+    if are_sorted_uniquely(keys):
+        return list(zip(keys, values))
     return [(index_key.key, values[-index_key.index])
             for index_key, _ in groupby(
                 sorted([(key, -index) for index, key in enumerate(keys)]),
@@ -69,5 +209,7 @@ def to_unique_sorted_items(keys: Sequence[Key], values: Sequence[Value]
 
 
 def to_unique_sorted_values(values: List[Value]) -> List[Value]:
+    if are_sorted_uniquely(values):
+        return values
     values.sort()
     return [value for value, _ in groupby(values)]
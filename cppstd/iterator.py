@@ -0,0 +1,19 @@
+from .core.abcs import LegacyInputIterator
+
+
+def advance(iterator: LegacyInputIterator, offset: int) -> None:
+    """
+    Moves given iterator by given offset,
+    takes logarithmic time for ordered collections' iterators
+    and constant time for random access ones.
+    """
+    iterator._advance(offset)
+
+
+def distance(first: LegacyInputIterator, last: LegacyInputIterator) -> int:
+    """
+    Returns number of increments needed to go from first iterator to last,
+    takes logarithmic time for ordered collections' iterators
+    and constant time for random access ones.
+    """
+    return first._distance_to(last)
@@ -1,37 +1,46 @@
 import builtins
-from typing import (Generic,
-                    Iterator)
+from typing import (Any,
+                    Generic,
+                    Iterable,
+                    Iterator,
+                    List,
+                    Optional,
+                    Tuple,
+                    overload)
 
-from .core import red_black
-from .core.tokenization import (SharedToken,
-                                Tokenizer)
-from .core.utils import identity
+from .core import (red_black,
+                   trees)
+from .core.keyed import (Compare,
+                         KeyFunction,
+                         to_key_and_compare,
+                         to_key_function)
+from .core.tokenization import Tokenizer
+from .core.utils import (identity,
+                         split_items,
+                         to_first_mismatch,
+                         to_normalized_index,
+                         to_packed_values,
+                         to_unpacked_values)
 from .hints import (Item,
                     Key,
                     Value)
 
 
 class map_iterator(Iterator[Value]):
-    __slots__ = '_node', '_tree', '_token'
+    __slots__ = '_items', '_tokenizer', '_version'
 
     def __init__(self,
-                 node: red_black.AnyNode,
-                 tree: red_black.Tree,
-                 token: SharedToken) -> None:
-        self._node = node
-        self._tree = tree
-        self._token = token
+                 items: Iterator[Item],
+                 tokenizer: Tokenizer) -> None:
+        self._items = items
+        self._tokenizer, self._version = tokenizer, tokenizer.version
 
     __iter__ = identity
 
     def __next__(self) -> Item:
-        if self._token.expired:
+        if self._version != self._tokenizer.version:
             raise RuntimeError('Iterator is invalidated.')
-        if self._node is red_black.NIL:
-            raise StopIteration
-        item = self._node.item
-        self._node = self._tree.successor(self._node)
-        return item
+        return next(self._items)
 
 
 class map(Generic[Key, Value]):
@@ -42,7 +51,7 @@ class map(Generic[Key, Value]):
             if node is red_black.NIL:
                 raise RuntimeError('Getting value of stop iterators '
                                    'is undefined.')
-            return node.item
+            return self._tree.to_item(node)
 
     class const_reverse_iterator(red_black.TreeReverseIterator,
                                  Generic[Key, Value]):
@@ -52,78 +61,349 @@ class map(Generic[Key, Value]):
             if node is red_black.NIL:
                 raise RuntimeError('Getting value of stop iterators '
                                    'is undefined.')
-            return node.item
+            return self._tree.to_item(node)
 
     iterator = const_iterator
     reverse_iterator = const_reverse_iterator
 
     __slots__ = '_tree', '_tokenizer'
 
-    def __init__(self, *_items: Item) -> None:
-        self._tree = red_black.Tree.from_components(*(zip(*_items)
-                                                      if _items
-                                                      else ((), ())))
+    def __init__(self,
+                 *_items: Item,
+                 pooled: bool = False,
+                 threaded: bool = False,
+                 key: Optional[KeyFunction] = None,
+                 compare: Optional[Compare] = None) -> None:
+        self._tree = trees.create_tree(*split_items(_items), pooled,
+                                       threaded, to_key_function(key, compare))
         self._tokenizer = Tokenizer()
 
+    def __contains__(self, key: Key) -> bool:
+        return self._tree.find(key) is not red_black.NIL
+
     def __eq__(self, other: 'map[Key, Value]') -> bool:
-        return (self._tree.items == other._tree.items
+        return ((len(self._tree) == len(other._tree)
+                 and to_first_mismatch(self._to_items(),
+                                       other._to_items()) is None)
                 if isinstance(other, map)
                 else NotImplemented)
 
+    def __getitem__(self, key: Key) -> Value:
+        """
+        Returns value for given key,
+        inserts ``None`` for it first if the key is absent.
+        """
+        node, inserted = self._tree.insert(key, None)
+        if inserted:
+            self._tokenizer.reset()
+        return self._tree.to_value(node)
+
     def __iter__(self) -> map_iterator[Value]:
-        return map_iterator(self._tree.min, self._tree,
-                            self._tokenizer.create_shared())
+        return map_iterator(self._to_items(), self._tokenizer)
+
+    def __reduce_ex__(self, protocol: int
+                      ) -> Tuple[type, Tuple[()],
+                                 Tuple[Any, Any, bool, bool,
+                                       Optional[KeyFunction],
+                                       Optional[Compare]]]:
+        tree = self._tree
+        # flat sorted keys & values are enough
+        # to rebuild the tree in linear time
+        return type(self), (), ((to_packed_values(tree.keys, protocol),
+                                 to_packed_values(tree.values, protocol),
+                                 trees.is_pooled(tree),
+                                 trees.is_threaded(tree))
+                                + to_key_and_compare(
+                                        trees.to_tree_key_function(tree)))
 
     def __repr__(self) -> str:
+        tree = self._tree
+        key, compare = to_key_and_compare(trees.to_tree_key_function(tree))
         return (type(self).__qualname__ + '('
-                + ', '.join(builtins.map(repr, self)) + ')')
+                + ', '.join(builtins.map(repr, self))
+                + (', pooled=True' if trees.is_pooled(tree) else '')
+                + (', threaded=True' if trees.is_threaded(tree) else '')
+                + ('' if key is None else ', key=' + repr(key))
+                + ('' if compare is None else ', compare=' + repr(compare))
+                + ')')
+
+    def __setstate__(self, state: Tuple[Any, Any, bool, bool,
+                                        Optional[KeyFunction],
+                                        Optional[Compare]]) -> None:
+        keys, values, pooled, threaded, key, compare = state
+        self._tree = trees.create_tree(to_unpacked_values(keys),
+                                       to_unpacked_values(values), pooled,
+                                       threaded, to_key_function(key, compare))
 
     def __setitem__(self, key: Key, value: Value) -> None:
+        _, inserted = self._tree.insert_or_assign(key, value)
+        # overwriting keeps the structure, so iteration can go on
+        if inserted:
+            self._tokenizer.reset()
+
+    def at(self, key: Key) -> Value:
         node = self._tree.find(key)
-        self._tokenizer.reset()
         if node is red_black.NIL:
-            self._tree.insert(key, value)
-        else:
-            node.value = value
+            raise KeyError(key)
+        return self._tree.to_value(node)
 
     def begin(self) -> iterator[Key, Value]:
-        return self.iterator(self._tree.min, self._tree,
-                             self._tokenizer.create_weak())
+        return self.iterator(self._tree.min, self._tree)
+
+    def bytes_per_element(self) -> float:
+        """
+        Returns size of the underlying storage in bytes
+        (not including elements themselves) per element.
+        """
+        return trees.to_bytes_per_element(self._tree)
 
     def cbegin(self) -> const_iterator[Key, Value]:
-        return self.iterator(self._tree.min, self._tree,
-                             self._tokenizer.create_weak())
+        return self.iterator(self._tree.min, self._tree)
 
     def cend(self) -> const_iterator[Key, Value]:
-        return self.const_iterator(red_black.NIL, self._tree,
-                                   self._tokenizer.create_weak())
+        return self.const_iterator(red_black.NIL, self._tree)
 
     def clear(self) -> None:
         self._tokenizer.reset()
         self._tree.clear()
 
+    def count(self, key: Key) -> int:
+        return int(self._tree.find(key) is not red_black.NIL)
+
     def crbegin(self) -> const_reverse_iterator[Key, Value]:
-        return self.const_reverse_iterator(self._tree.max, self._tree,
-                                           self._tokenizer.create_weak())
+        return self.const_reverse_iterator(self._tree.max, self._tree)
 
     def crend(self) -> const_reverse_iterator[Key, Value]:
-        return self.const_reverse_iterator(red_black.NIL, self._tree,
-                                           self._tokenizer.create_weak())
+        return self.const_reverse_iterator(red_black.NIL, self._tree)
+
+    def difference(self, other: 'map[Key, Value]') -> 'map[Key, Value]':
+        """Returns map of items with keys which are absent in other map."""
+        if len(self._tree) > len(other._tree):
+            result = self._copy()
+            result.difference_update(other)
+            return result
+        tree, other_tree = self._tree, other._tree
+        return self._from_sorted(
+                [tree.to_item(node)
+                 for node in tree
+                 if other_tree.find(tree.to_key(node)) is red_black.NIL])
+
+    def difference_update(self, other: 'map[Key, Value]') -> None:
+        """Removes items with keys which are present in other map."""
+        if not other._tree:
+            return
+        self._tokenizer.reset()
+        trees.subtract(self._tree, other._tree)
 
     def empty(self) -> bool:
         return not self._tree
 
     def end(self) -> iterator[Key, Value]:
-        return self.iterator(red_black.NIL, self._tree,
-                             self._tokenizer.create_weak())
+        return self.iterator(red_black.NIL, self._tree)
+
+    def equal_range(self, key: Key) -> Tuple[const_iterator[Key, Value],
+                                             const_iterator[Key, Value]]:
+        tree = self._tree
+        start, stop = trees.to_equal_range(tree, key)
+        return (self.const_iterator(start, tree),
+                self.const_iterator(stop, tree))
+
+    @overload
+    def erase(self, key: Key) -> int:
+        """Removes item with given key, returns number of removed items."""
+
+    @overload
+    def erase(self, position: const_iterator) -> iterator:
+        """
+        Removes item at given position,
+        returns iterator to the following item.
+        """
+
+    @overload
+    def erase(self, first: const_iterator, last: const_iterator) -> iterator:
+        """
+        Removes items from range,
+        returns iterator to the item which follows the last removed one.
+        """
+
+    def erase(self, first_arg, second_arg=None):
+        return trees.erase(self._tree, self._tokenizer, self.iterator,
+                           first_arg, second_arg)
+
+    def find(self, key: Key) -> iterator[Key, Value]:
+        return self.iterator(self._tree.find(key), self._tree)
+
+    @classmethod
+    def from_sorted(cls,
+                    items: Iterable[Item],
+                    *,
+                    pooled: bool = False,
+                    threaded: bool = False,
+                    key: Optional[KeyFunction] = None,
+                    compare: Optional[Compare] = None) -> 'map[Key, Value]':
+        """
+        Constructs map from given items,
+        takes linear time if they are sorted by keys
+        in strictly ascending order.
+        """
+        return cls(*items,
+                   pooled=pooled,
+                   threaded=threaded,
+                   key=key,
+                   compare=compare)
+
+    def get_many(self,
+                 keys: Iterable[Key],
+                 default: Value = None) -> List[Value]:
+        """
+        Returns values for given keys (default for absent ones)
+        in a single sorted-batch pass, results follow the order of keys.
+        """
+        tree = self._tree
+        return [default if node is red_black.NIL else tree.to_value(node)
+                for node in tree.find_many(list(keys))]
+
+    def insert_or_assign(self, key: Key, value: Value
+                         ) -> Tuple[iterator, bool]:
+        """
+        Inserts given key with value or assigns the value
+        if the key is present.
+        """
+        node, inserted = self._tree.insert_or_assign(key, value)
+        if inserted:
+            self._tokenizer.reset()
+        return self.iterator(node, self._tree), inserted
+
+    def intersection(self, other: 'map[Key, Value]') -> 'map[Key, Value]':
+        """
+        Returns map of items with keys which are present in both maps,
+        values are taken from this map.
+        """
+        tree, other_tree = self._tree, other._tree
+        return self._from_sorted(
+                [tree.to_item(node)
+                 for node in tree
+                 if other_tree.find(tree.to_key(node)) is not red_black.NIL]
+                if len(tree) <= len(other_tree)
+                else [tree.to_item(node)
+                      for node in builtins.map(tree.find, other_tree.keys)
+                      if node is not red_black.NIL])
+
+    def intersection_update(self, other: 'map[Key, Value]') -> None:
+        """Removes items with keys which are absent in other map."""
+        self._tokenizer.reset()
+        trees.intersect(self._tree, other._tree)
+
+    def irange(self,
+               lo: Optional[Key] = None,
+               hi: Optional[Key] = None,
+               inclusive: Tuple[bool, bool] = (True, False),
+               reverse: bool = False) -> map_iterator[Item]:
+        """
+        Returns lazy iterator over items with keys between given bounds
+        (``None`` stands for the absent one)
+        in ascending or descending order of keys.
+        """
+        tree = self._tree
+        return map_iterator(
+                builtins.map(tree.to_item,
+                             trees.iterate_range(tree, lo, hi, inclusive,
+                                                 reverse)),
+                self._tokenizer)
+
+    def items(self) -> List[Item]:
+        """Returns list of items in the keys order."""
+        return self._tree.items
+
+    def keys(self) -> List[Key]:
+        """Returns list of keys in ascending order."""
+        return self._tree.keys
+
+    def lower_bound(self, key: Key) -> const_iterator[Key, Value]:
+        return self.const_iterator(self._tree.lower_bound(key), self._tree)
+
+    def nth(self, index: int) -> Item:
+        """Returns item with given index in the sorted order."""
+        return self._tree.to_item(self._tree.select(
+                to_normalized_index(index, len(self._tree))))
+
+    def rank(self, key: Key) -> int:
+        """Returns number of items with keys less than given key."""
+        return self._tree.rank(key)
 
     def rbegin(self) -> reverse_iterator[Key, Value]:
-        return self.reverse_iterator(self._tree.max, self._tree,
-                                     self._tokenizer.create_weak())
+        return self.reverse_iterator(self._tree.max, self._tree)
 
     def rend(self) -> reverse_iterator[Key, Value]:
-        return self.reverse_iterator(red_black.NIL, self._tree,
-                                     self._tokenizer.create_weak())
+        return self.reverse_iterator(red_black.NIL, self._tree)
 
     def size(self) -> int:
         return len(self._tree)
+
+    def symmetric_difference(self, other: 'map[Key, Value]'
+                             ) -> 'map[Key, Value]':
+        """Returns map of items with keys which are present in one map."""
+        result = self._copy()
+        result.symmetric_difference_update(other)
+        return result
+
+    def symmetric_difference_update(self, other: 'map[Key, Value]') -> None:
+        """
+        Removes items with keys which are present in other map
+        and adds ones with keys which are not present.
+        """
+        if not other._tree:
+            return
+        self._tokenizer.reset()
+        self._tree.symmetric_difference(
+                self._create_tree(other._tree.items))
+
+    def try_emplace(self, key: Key, value: Value) -> Tuple[iterator, bool]:
+        """
+        Inserts given key with value if the key is absent,
+        present values stay intact.
+        """
+        node, inserted = self._tree.insert(key, value)
+        if inserted:
+            self._tokenizer.reset()
+        return self.iterator(node, self._tree), inserted
+
+    def union(self, other: 'map[Key, Value]') -> 'map[Key, Value]':
+        """
+        Returns map of items with keys which are present in any map,
+        values for common keys are taken from this map.
+        """
+        result = self._copy()
+        result.update(other)
+        return result
+
+    def update(self, other: 'map[Key, Value]') -> None:
+        """
+        Adds items of other map with keys which are not present,
+        values for present keys stay intact.
+        """
+        if not other._tree:
+            return
+        self._tokenizer.reset()
+        self._tree.union(self._create_tree(other._tree.items))
+
+    def upper_bound(self, key: Key) -> const_iterator[Key, Value]:
+        return self.const_iterator(self._tree.upper_bound(key), self._tree)
+
+    def values(self) -> List[Value]:
+        """Returns list of values in the keys order."""
+        return self._tree.values
+
+    def _copy(self) -> 'map[Key, Value]':
+        return self._from_sorted(self._tree.items)
+
+    def _create_tree(self, items: Iterable[Item]) -> trees.AnyTree:
+        return trees.create_tree_like(self._tree, *split_items(items))
+
+    def _from_sorted(self, items: List[Item]) -> 'map[Key, Value]':
+        result = type(self)()
+        result._tree = self._create_tree(items)
+        return result
+
+    def _to_items(self) -> Iterator[Item]:
+        return builtins.map(self._tree.to_item, self._tree)
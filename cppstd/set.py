@@ -1,41 +1,47 @@
 import builtins
 from collections import abc
 from copy import copy as _copy
-from typing import (Generic,
+from typing import (Any,
+                    Generic,
                     Iterable,
                     Iterator,
+                    List,
+                    Optional,
                     Tuple,
                     overload)
 
-from .core import red_black
+from .core import (red_black,
+                   trees)
 from .core.abcs import LegacyInputIterator
-from .core.tokenization import (SharedToken,
-                                Tokenizer)
-from .core.utils import identity
+from .core.keyed import (Compare,
+                         KeyFunction,
+                         to_key_and_compare,
+                         to_key_function)
+from .core.tokenization import Tokenizer
+from .core.utils import (identity,
+                         should_rebuild,
+                         to_first_mismatch,
+                         to_normalized_index,
+                         to_packed_values,
+                         to_unpacked_values)
 from .hints import Value
 
 
 class set_iterator(Iterator[Value]):
-    __slots__ = '_node', '_tree', '_token'
+    __slots__ = '_values', '_tokenizer', '_version'
 
     def __init__(self,
-                 node: red_black.AnyNode,
-                 tree: red_black.Tree,
-                 token: SharedToken) -> None:
-        self._node = node
-        self._tree = tree
-        self._token = token
+                 values: Iterator[Value],
+                 tokenizer: Tokenizer) -> None:
+        self._values = values
+        self._tokenizer, self._version = tokenizer, tokenizer.version
 
     __iter__ = identity
 
     def __next__(self) -> Value:
-        if self._token.expired:
+        if self._version != self._tokenizer.version:
             raise RuntimeError('Iterator is invalidated.')
-        if self._node is red_black.NIL:
-            raise StopIteration
-        value = self._node.key
-        self._node = self._tree.successor(self._node)
-        return value
+        return next(self._values)
 
 
 class set(Generic[Value]):
@@ -46,7 +52,7 @@ class set(Generic[Value]):
             if node is red_black.NIL:
                 raise RuntimeError('Getting value of stop iterators '
                                    'is undefined.')
-            return node.key
+            return self._tree.to_key(node)
 
     class const_reverse_iterator(red_black.TreeReverseIterator,
                                  Generic[Value]):
@@ -56,70 +62,195 @@ class set(Generic[Value]):
             if node is red_black.NIL:
                 raise RuntimeError('Getting value of stop iterators '
                                    'is undefined.')
-            return node.key
+            return self._tree.to_key(node)
 
     iterator = const_iterator
     reverse_iterator = const_reverse_iterator
 
     __slots__ = '_tree', '_tokenizer'
 
-    def __init__(self, *_values: Value) -> None:
-        self._tree = red_black.Tree.from_components(_values)
+    def __init__(self,
+                 *_values: Value,
+                 pooled: bool = False,
+                 threaded: bool = False,
+                 key: Optional[KeyFunction] = None,
+                 compare: Optional[Compare] = None) -> None:
+        self._tree = trees.create_tree(_values, None, pooled, threaded,
+                                       to_key_function(key, compare))
         self._tokenizer = Tokenizer()
 
+    def __contains__(self, value: Value) -> bool:
+        return self._tree.find(value) is not red_black.NIL
+
     def __eq__(self, other: 'set[Value]') -> bool:
-        return (self._tree.keys == other._tree.keys
+        return ((len(self._tree) == len(other._tree)
+                 and to_first_mismatch(self._to_values(),
+                                       other._to_values()) is None)
                 if isinstance(other, set)
                 else NotImplemented)
 
     def __iter__(self) -> set_iterator[Value]:
-        return set_iterator(self._tree.min, self._tree,
-                            self._tokenizer.create_shared())
+        return set_iterator(self._to_values(), self._tokenizer)
 
     def __le__(self, other: 'set[Value]') -> bool:
-        return (self._tree.keys <= other._tree.keys
-                if isinstance(other, set)
-                else NotImplemented)
+        if not isinstance(other, set):
+            return NotImplemented
+        mismatch = to_first_mismatch(self._to_values(), other._to_values())
+        return (len(self._tree) <= len(other._tree)
+                if mismatch is None
+                else mismatch[0] < mismatch[1])
 
     def __lt__(self, other: 'set[Value]') -> bool:
-        return (self._tree.keys < other._tree.keys
-                if isinstance(other, set)
-                else NotImplemented)
+        if not isinstance(other, set):
+            return NotImplemented
+        mismatch = to_first_mismatch(self._to_values(), other._to_values())
+        return (len(self._tree) < len(other._tree)
+                if mismatch is None
+                else mismatch[0] < mismatch[1])
+
+    def __reduce_ex__(self, protocol: int
+                      ) -> Tuple[type, Tuple[()],
+                                 Tuple[Any, bool, bool,
+                                       Optional[KeyFunction],
+                                       Optional[Compare]]]:
+        tree = self._tree
+        # flat sorted values are enough to rebuild the tree in linear time
+        return type(self), (), ((to_packed_values(tree.keys, protocol),
+                                 trees.is_pooled(tree),
+                                 trees.is_threaded(tree))
+                                + to_key_and_compare(
+                                        trees.to_tree_key_function(tree)))
 
     def __repr__(self) -> str:
+        tree = self._tree
+        key, compare = to_key_and_compare(trees.to_tree_key_function(tree))
         return (type(self).__qualname__ + '('
-                + ', '.join(builtins.map(repr, self)) + ')')
+                + ', '.join(builtins.map(repr, self))
+                + (', pooled=True' if trees.is_pooled(tree) else '')
+                + (', threaded=True' if trees.is_threaded(tree) else '')
+                + ('' if key is None else ', key=' + repr(key))
+                + ('' if compare is None else ', compare=' + repr(compare))
+                + ')')
+
+    def __setstate__(self, state: Tuple[Any, bool, bool,
+                                        Optional[KeyFunction],
+                                        Optional[Compare]]) -> None:
+        values, pooled, threaded, key, compare = state
+        self._tree = trees.create_tree(to_unpacked_values(values), None,
+                                       pooled, threaded,
+                                       to_key_function(key, compare))
 
     def begin(self) -> iterator[Value]:
-        return self.iterator(self._tree.min, self._tree,
-                             self._tokenizer.create_weak())
+        return self.iterator(self._tree.min, self._tree)
+
+    def bytes_per_element(self) -> float:
+        """
+        Returns size of the underlying storage in bytes
+        (not including elements themselves) per element.
+        """
+        return trees.to_bytes_per_element(self._tree)
 
     def cbegin(self) -> const_iterator[Value]:
-        return self.const_iterator(self._tree.min, self._tree,
-                                   self._tokenizer.create_weak())
+        return self.const_iterator(self._tree.min, self._tree)
 
     def cend(self) -> const_iterator[Value]:
-        return self.const_iterator(red_black.NIL, self._tree,
-                                   self._tokenizer.create_weak())
+        return self.const_iterator(red_black.NIL, self._tree)
 
     def clear(self) -> None:
         self._tokenizer.reset()
         self._tree.clear()
 
+    def contains_many(self, values: Iterable[Value]) -> List[bool]:
+        """
+        Checks membership of given values in a single sorted-batch pass,
+        results follow the order of values.
+        """
+        return [node is not red_black.NIL
+                for node in self._tree.find_many(list(values))]
+
+    def count(self, value: Value) -> int:
+        return int(self._tree.find(value) is not red_black.NIL)
+
     def crbegin(self) -> const_reverse_iterator[Value]:
-        return self.const_reverse_iterator(self._tree.max, self._tree,
-                                           self._tokenizer.create_weak())
+        return self.const_reverse_iterator(self._tree.max, self._tree)
 
     def crend(self) -> const_reverse_iterator[Value]:
-        return self.const_reverse_iterator(red_black.NIL, self._tree,
-                                           self._tokenizer.create_weak())
+        return self.const_reverse_iterator(red_black.NIL, self._tree)
+
+    def difference(self, other: 'set[Value]') -> 'set[Value]':
+        """Returns set of values which are not present in other set."""
+        if len(self._tree) > len(other._tree):
+            result = self._copy()
+            result.difference_update(other)
+            return result
+        other_tree = other._tree
+        return self._from_sorted(
+                [value
+                 for value in self._to_values()
+                 if other_tree.find(value) is red_black.NIL])
+
+    def difference_update(self, other: 'set[Value]') -> None:
+        """Removes values which are present in other set."""
+        if not other._tree:
+            return
+        self._tokenizer.reset()
+        trees.subtract(self._tree, other._tree)
 
     def empty(self) -> bool:
         return not self._tree
 
     def end(self) -> iterator[Value]:
-        return self.iterator(red_black.NIL, self._tree,
-                             self._tokenizer.create_weak())
+        return self.iterator(red_black.NIL, self._tree)
+
+    def equal_range(self, value: Value
+                    ) -> Tuple[const_iterator[Value], const_iterator[Value]]:
+        tree = self._tree
+        start, stop = trees.to_equal_range(tree, value)
+        return (self.const_iterator(start, tree),
+                self.const_iterator(stop, tree))
+
+    @overload
+    def erase(self, value: Value) -> int:
+        """Removes given value, returns number of removed elements."""
+
+    @overload
+    def erase(self, position: const_iterator) -> iterator:
+        """
+        Removes element at given position,
+        returns iterator to the following element.
+        """
+
+    @overload
+    def erase(self, first: const_iterator, last: const_iterator) -> iterator:
+        """
+        Removes elements from range,
+        returns iterator to the element which follows the last removed one.
+        """
+
+    def erase(self, first_arg, second_arg=None):
+        return trees.erase(self._tree, self._tokenizer, self.iterator,
+                           first_arg, second_arg)
+
+    def find(self, value: Value) -> iterator[Value]:
+        return self.iterator(self._tree.find(value), self._tree)
+
+    @classmethod
+    def from_sorted(cls,
+                    values: Iterable[Value],
+                    *,
+                    pooled: bool = False,
+                    threaded: bool = False,
+                    key: Optional[KeyFunction] = None,
+                    compare: Optional[Compare] = None) -> 'set[Value]':
+        """
+        Constructs set from given values,
+        takes linear time if they are sorted in strictly ascending order.
+        """
+        return cls(*values,
+                   pooled=pooled,
+                   threaded=threaded,
+                   key=key,
+                   compare=compare)
 
     @overload
     def insert(self, value: Value) -> Tuple[iterator, bool]:
@@ -136,7 +267,7 @@ class set(Generic[Value]):
         """Inserts values from range."""
 
     @overload
-    def insert(self, hint: const_iterator, value: Value) -> None:
+    def insert(self, hint: const_iterator, value: Value) -> iterator:
         """
         Inserts values in the position as close as possible just prior to hint.
         """
@@ -147,15 +278,12 @@ class set(Generic[Value]):
                 values = list(first_arg)
                 if values:
                     self._tokenizer.reset()
-                for value in values:
-                    self._tree.insert(value, None)
+                self._insert_values(values)
             else:
                 node, inserted = self._tree.insert(first_arg, None)
                 if inserted:
                     self._tokenizer.reset()
-                return (set.iterator(node, self._tree,
-                                     self._tokenizer.create_weak()),
-                        inserted)
+                return set.iterator(node, self._tree), inserted
         elif isinstance(second_arg, LegacyInputIterator):
             if not isinstance(first_arg, type(second_arg)):
                 raise TypeError('Both ends of the insertion range '
@@ -169,20 +297,123 @@ class set(Generic[Value]):
                 values.append(first.inc().value)
             if values:
                 self._tokenizer.reset()
-            for value in values:
-                self._tree.insert(value, None)
+            self._insert_values(values)
         else:
-            self._tokenizer.reset()
-            self._tree.insert(second_arg, None)
+            if first_arg._tree is not self._tree:
+                raise RuntimeError('Using iterators from other collections '
+                                   'as hints is undefined.')
+            node, inserted = self._tree.insert_hinted(
+                    first_arg._to_validated_node(), second_arg, None)
+            if inserted:
+                self._tokenizer.reset()
+            return set.iterator(node, self._tree)
         return None
 
+    def intersection(self, other: 'set[Value]') -> 'set[Value]':
+        """Returns set of values which are present in both sets."""
+        tree, other_tree = self._tree, other._tree
+        if len(tree) > len(other_tree):
+            tree, other_tree = other_tree, tree
+        return self._from_sorted(
+                [value
+                 for value in builtins.map(tree.to_key, tree)
+                 if other_tree.find(value) is not red_black.NIL])
+
+    def intersection_update(self, other: 'set[Value]') -> None:
+        """Removes values which are not present in other set."""
+        self._tokenizer.reset()
+        trees.intersect(self._tree, other._tree)
+
+    def irange(self,
+               lo: Optional[Value] = None,
+               hi: Optional[Value] = None,
+               inclusive: Tuple[bool, bool] = (True, False),
+               reverse: bool = False) -> set_iterator[Value]:
+        """
+        Returns lazy iterator over values between given bounds
+        (``None`` stands for the absent one)
+        in ascending or descending order.
+        """
+        tree = self._tree
+        return set_iterator(
+                builtins.map(tree.to_key,
+                             trees.iterate_range(tree, lo, hi, inclusive,
+                                                 reverse)),
+                self._tokenizer)
+
+    def lower_bound(self, value: Value) -> const_iterator[Value]:
+        return self.const_iterator(self._tree.lower_bound(value), self._tree)
+
+    def nth(self, index: int) -> Value:
+        """Returns element with given index in the sorted order."""
+        return self._tree.to_key(self._tree.select(
+                to_normalized_index(index, len(self._tree))))
+
+    def rank(self, value: Value) -> int:
+        """Returns number of elements which are less than given value."""
+        return self._tree.rank(value)
+
     def rbegin(self) -> reverse_iterator[Value]:
-        return self.reverse_iterator(self._tree.max, self._tree,
-                                     self._tokenizer.create_weak())
+        return self.reverse_iterator(self._tree.max, self._tree)
 
     def rend(self) -> reverse_iterator[Value]:
-        return self.reverse_iterator(red_black.NIL, self._tree,
-                                     self._tokenizer.create_weak())
+        return self.reverse_iterator(red_black.NIL, self._tree)
 
     def size(self) -> int:
         return len(self._tree)
+
+    def symmetric_difference(self, other: 'set[Value]') -> 'set[Value]':
+        """Returns set of values which are present in exactly one set."""
+        result = self._copy()
+        result.symmetric_difference_update(other)
+        return result
+
+    def symmetric_difference_update(self, other: 'set[Value]') -> None:
+        """
+        Removes values which are present in other set
+        and adds ones which are not present.
+        """
+        if not other._tree:
+            return
+        self._tokenizer.reset()
+        self._tree.symmetric_difference(
+                self._create_tree(other._tree.keys))
+
+    def union(self, other: 'set[Value]') -> 'set[Value]':
+        """Returns set of values which are present in any set."""
+        result = self._copy()
+        result.update(other)
+        return result
+
+    def update(self, other: 'set[Value]') -> None:
+        """Adds values of other set."""
+        if not other._tree:
+            return
+        self._tokenizer.reset()
+        self._tree.union(self._create_tree(other._tree.keys))
+
+    def upper_bound(self, value: Value) -> const_iterator[Value]:
+        return self.const_iterator(self._tree.upper_bound(value), self._tree)
+
+    def _copy(self) -> 'set[Value]':
+        return self._from_sorted(self._tree.keys)
+
+    def _create_tree(self, values: Iterable[Value]) -> trees.AnyTree:
+        return trees.create_tree_like(self._tree, values, None)
+
+    def _from_sorted(self, values: List[Value]) -> 'set[Value]':
+        result = type(self)()
+        result._tree = self._create_tree(values)
+        return result
+
+    def _insert_values(self, values: List[Value]) -> None:
+        if should_rebuild(len(values), len(self._tree)):
+            self._tree.merge(values)
+        else:
+            for value in values:
+                self._tree.insert(value, None)
+
+    def _to_values(self) -> Iterator[Value]:
+        # unlike stepping through successors
+        # tree traversal keeps explicit stack of ancestors
+        return builtins.map(self._tree.to_key, self._tree)
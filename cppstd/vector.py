@@ -1,3 +1,4 @@
+from array import array
 from collections import abc
 from copy import copy as _copy
 from itertools import repeat
@@ -7,35 +8,42 @@ from typing import (Any,
                     Iterator,
                     List,
                     Optional,
+                    Tuple,
+                    Union,
                     overload)
 
-from reprit.base import (generate_repr,
-                         seekers)
-
 from .core.abcs import (LegacyInputIterator,
                         LegacyRandomAccessIterator)
-from .core.tokenization import (SharedToken,
-                                Tokenizer,
-                                WeakToken)
-from .core.utils import identity
+from .core.tokenization import Tokenizer
+from .core.utils import (identity,
+                         to_buffer,
+                         to_first_mismatch,
+                         to_unpacked_values)
 from .hints import Value
 
+Storage = Union[List[Value], array]
+# distinguishes omitted arguments from ``None`` values
+_MISSING = object()
+
 
 class vector_iterator(Iterator[Value]):
-    __slots__ = '_index', '_values', '_token'
+    __slots__ = '_index', '_values', '_tokenizer', '_version'
 
     def __init__(self,
                  index: int,
-                 values: List[Value],
-                 token: SharedToken) -> None:
+                 values: Storage,
+                 tokenizer: Tokenizer) -> None:
         self._index = index
         self._values = values
-        self._token = token
+        self._tokenizer, self._version = tokenizer, tokenizer.version
 
     __iter__ = identity
 
+    def __length_hint__(self) -> int:
+        return max(len(self._values) - self._index, 0)
+
     def __next__(self) -> Value:
-        if self._token.expired:
+        if self._version != self._tokenizer.version:
             raise RuntimeError('Iterator is invalidated.')
         try:
             value = self._values[self._index]
@@ -47,15 +55,15 @@ class vector_iterator(Iterator[Value]):
 
 
 class _base_vector_iterator(LegacyRandomAccessIterator):
-    __slots__ = '_index', '_values', '_token'
+    __slots__ = '_index', '_values', '_size', '_tokenizer', '_version'
 
     def __init__(self,
                  index: int,
-                 values: List[Value],
-                 token: WeakToken) -> None:
+                 values: Storage,
+                 tokenizer: Tokenizer) -> None:
         self._index = index
-        self._values = values
-        self._token = token
+        self._values, self._size = values, len(values)
+        self._tokenizer, self._version = tokenizer, tokenizer.version
 
     def __eq__(self, other: Any) -> bool:
         return (self._validate_comparison_with(other)
@@ -81,7 +89,7 @@ class _base_vector_iterator(LegacyRandomAccessIterator):
             raise RuntimeError('Post-decrementing of start iterators '
                                'is undefined.')
         self._index -= 1
-        return type(self)(index, self._values, self._token)
+        return type(self)(index, self._values, self._tokenizer)
 
     def inc(self) -> '_base_vector_iterator':
         index = self._to_validated_index()
@@ -89,7 +97,7 @@ class _base_vector_iterator(LegacyRandomAccessIterator):
             raise RuntimeError('Post-incrementing of stop iterators '
                                'is undefined.')
         self._index += 1
-        return type(self)(index, self._values, self._token)
+        return type(self)(index, self._values, self._tokenizer)
 
     def next(self) -> '_base_vector_iterator':
         index = self._to_validated_index()
@@ -107,6 +115,13 @@ class _base_vector_iterator(LegacyRandomAccessIterator):
         self._index -= 1
         return self
 
+    def _advance(self, offset: int) -> None:
+        self._index = self._move_index(offset)
+
+    def _distance_to(self, other: '_base_vector_iterator') -> int:
+        self._validate_comparison_with(other)
+        return other._to_validated_index() - self._to_validated_index()
+
     def _move_index(self, offset: int) -> int:
         index = self._to_validated_index()
         size = len(self._values)
@@ -125,13 +140,23 @@ class _base_vector_iterator(LegacyRandomAccessIterator):
                                     'is undefined.')
         return index + offset
 
+    def _rebase(self, size: int) -> None:
+        if self._index == self._size:
+            # stop iterator points past the elements appended since
+            raise RuntimeError('Iterator is invalidated.')
+        self._size = size
+
     def _to_validated_index(self) -> int:
         self._validate()
         return self._index
 
     def _validate(self) -> None:
-        if self._token.expired:
+        if self._version != self._tokenizer.version:
             raise RuntimeError('Iterator is invalidated.')
+        size = len(self._values)
+        if size != self._size:
+            # without reallocation elements can only be appended
+            self._rebase(size)
 
     def _validate_comparison_with(self,
                                   other: '_base_vector_iterator') -> None:
@@ -144,7 +169,7 @@ class vector(Generic[Value]):
     class const_iterator(_base_vector_iterator, Generic[Value]):
         def __add__(self, offset: int) -> 'vector.const_iterator[Value]':
             return vector.const_iterator(self._move_index(offset),
-                                         self._values, self._token)
+                                         self._values, self._tokenizer)
 
         __radd__ = __add__
 
@@ -158,7 +183,7 @@ class vector(Generic[Value]):
 
         def __sub__(self, offset: int) -> 'vector.const_iterator[Value]':
             return vector.const_iterator(self._move_index(-offset),
-                                         self._values, self._token)
+                                         self._values, self._tokenizer)
 
         @property
         def value(self) -> Value:
@@ -172,7 +197,7 @@ class vector(Generic[Value]):
         def __add__(self,
                     offset: int) -> 'vector.const_reverse_iterator[Value]':
             return vector.const_reverse_iterator(self._move_index(offset),
-                                                 self._values, self._token)
+                                                 self._values, self._tokenizer)
 
         __radd__ = __add__
 
@@ -189,7 +214,7 @@ class vector(Generic[Value]):
         def __sub__(self,
                     offset: int) -> 'vector.const_reverse_iterator[Value]':
             return vector.const_reverse_iterator(self._move_index(-offset),
-                                                 self._values, self._token)
+                                                 self._values, self._tokenizer)
 
         @property
         def value(self) -> Value:
@@ -200,10 +225,18 @@ class vector(Generic[Value]):
                                    'is undefined.')
             return self._values[size - 1 - self._index]
 
+        def _rebase(self, size: int) -> None:
+            if not self._index:
+                # start iterator is the stop one of the forward direction
+                raise RuntimeError('Iterator is invalidated.')
+            # indices are counted from the back
+            self._index += size - self._size
+            self._size = size
+
     class iterator(_base_vector_iterator, Generic[Value]):
         def __add__(self, offset: int) -> 'vector.iterator[Value]':
             return vector.iterator(self._move_index(offset), self._values,
-                                   self._token)
+                                   self._tokenizer)
 
         __radd__ = __add__
 
@@ -217,7 +250,7 @@ class vector(Generic[Value]):
 
         def __sub__(self, offset: int) -> 'vector.iterator[Value]':
             return vector.iterator(self._move_index(-offset), self._values,
-                                   self._token)
+                                   self._tokenizer)
 
         @property
         def value(self) -> Value:
@@ -239,7 +272,7 @@ class vector(Generic[Value]):
         def __add__(self,
                     offset: int) -> 'vector.reverse_iterator[Value]':
             return vector.reverse_iterator(self._move_index(offset),
-                                           self._values, self._token)
+                                           self._values, self._tokenizer)
 
         __radd__ = __add__
 
@@ -256,7 +289,7 @@ class vector(Generic[Value]):
         def __sub__(self,
                     offset: int) -> 'vector.reverse_iterator[Value]':
             return vector.reverse_iterator(self._move_index(-offset),
-                                           self._values, self._token)
+                                           self._values, self._tokenizer)
 
         @property
         def value(self) -> Value:
@@ -276,19 +309,38 @@ class vector(Generic[Value]):
                                    'is undefined.')
             self._values[size - 1 - self._index] = value
 
-    __slots__ = '_values', '_tokenizer'
+        def _rebase(self, size: int) -> None:
+            if not self._index:
+                # start iterator is the stop one of the forward direction
+                raise RuntimeError('Iterator is invalidated.')
+            # indices are counted from the back
+            self._index += size - self._size
+            self._size = size
+
+    __slots__ = '_values', '_tokenizer', '_capacity'
 
-    def __init__(self, *values: Value) -> None:
-        self._values = list(values)  # type: List[Value]
+    def __init__(self, *values: Value, dtype: Optional[str] = None) -> None:
+        self._values = (list(values)
+                        if dtype is None
+                        else array(dtype, values))  # type: Storage
         self._tokenizer = Tokenizer()
+        # Python storages hide their allocation,
+        # so the capacity is the number of elements
+        # which can be pushed back without invalidation of iterators
+        self._capacity = 0
 
-    __repr__ = generate_repr(__init__,
-                             field_seeker=seekers.complex_)
+    def __buffer__(self, flags: int) -> memoryview:
+        return self.data()
 
     def __eq__(self, other: 'vector') -> bool:
-        return (self._values == other._values
-                if isinstance(other, vector)
-                else NotImplemented)
+        if not isinstance(other, vector):
+            return NotImplemented
+        values, other_values = self._values, other._values
+        if type(values) is type(other_values):
+            return values == other_values
+        # typed and untyped storages do not compare with each other
+        return (len(values) == len(other_values)
+                and to_first_mismatch(values, other_values) is None)
 
     def __getitem__(self, index: int) -> Value:
         if isinstance(index, int):
@@ -299,17 +351,51 @@ class vector(Generic[Value]):
 
     def __iter__(self) -> vector_iterator[Value]:
         return vector_iterator(0, self._values,
-                               self._tokenizer.create_shared())
+                               self._tokenizer)
 
     def __le__(self, other: 'vector') -> bool:
-        return (self._values <= other._values
-                if isinstance(other, vector)
-                else NotImplemented)
+        if not isinstance(other, vector):
+            return NotImplemented
+        values, other_values = self._values, other._values
+        if type(values) is type(other_values):
+            return values <= other_values
+        mismatch = to_first_mismatch(values, other_values)
+        return (len(values) <= len(other_values)
+                if mismatch is None
+                else mismatch[0] < mismatch[1])
 
     def __lt__(self, other: 'vector') -> bool:
-        return (self._values < other._values
-                if isinstance(other, vector)
-                else NotImplemented)
+        if not isinstance(other, vector):
+            return NotImplemented
+        values, other_values = self._values, other._values
+        if type(values) is type(other_values):
+            return values < other_values
+        mismatch = to_first_mismatch(values, other_values)
+        return (len(values) < len(other_values)
+                if mismatch is None
+                else mismatch[0] < mismatch[1])
+
+    def __reduce_ex__(self, protocol: int
+                      ) -> Tuple[type, Tuple[()], Tuple[Any, Optional[str]]]:
+        # typed storage is passed as raw bytes without boxing its elements
+        values = self._values
+        return type(self), (), ((values
+                                 if isinstance(values, list)
+                                 else to_buffer(values, protocol)),
+                                self._to_dtype())
+
+    def __repr__(self) -> str:
+        dtype = self._to_dtype()
+        return (type(self).__qualname__ + '('
+                + ', '.join(map(repr, self._values))
+                + ('' if dtype is None else ', dtype=' + repr(dtype))
+                + ')')
+
+    def __setstate__(self, state: Tuple[Any, Optional[str]]) -> None:
+        values, dtype = state
+        self._values = (values
+                        if dtype is None
+                        else to_unpacked_values(values, dtype))
 
     @overload
     def __setitem__(self, item: int, value: Value) -> None:
@@ -322,37 +408,121 @@ class vector(Generic[Value]):
     def __setitem__(self, item, value):
         if isinstance(item, slice):
             start, stop, step = item.indices(len(self._values))
-            value = list(value)
+            value = self._to_storage(value)
             if stop > start or step == 1 and value:
                 self._tokenizer.reset()
         self._values[item] = value
 
+    @overload
+    def assign(self, count: int, value: Value) -> None:
+        """Replaces elements with given value repeated given count of times."""
+
+    @overload
+    def assign(self, first: LegacyInputIterator, last: LegacyInputIterator
+               ) -> None:
+        """Replaces elements with the ones from given range."""
+
+    @overload
+    def assign(self, values: Iterable[Value]) -> None:
+        """Replaces elements with given values."""
+
+    def assign(self, first_arg, second_arg=_MISSING):
+        if second_arg is _MISSING:
+            values = self._to_storage(first_arg)
+        elif isinstance(first_arg, int):
+            if first_arg < 0:
+                raise ValueError('`count` should be positive, but found {}.'
+                                 .format(first_arg))
+            values = self._to_storage(repeat(second_arg, first_arg))
+        else:
+            values = self._to_range_storage(first_arg, second_arg)
+        self._tokenizer.reset()
+        # storage is replaced in place, so iterators keep referring to it
+        self._values[:] = values
+
     def begin(self) -> 'iterator[Value]':
-        return vector.iterator(0, self._values, self._tokenizer.create_weak())
+        return vector.iterator(0, self._values, self._tokenizer)
+
+    def capacity(self) -> int:
+        return max(self._capacity, len(self._values))
 
     def cbegin(self) -> 'const_iterator[Value]':
         return vector.const_iterator(0, self._values,
-                                     self._tokenizer.create_weak())
+                                     self._tokenizer)
 
     def cend(self) -> 'const_iterator[Value]':
         return vector.const_iterator(self.size(), self._values,
-                                     self._tokenizer.create_weak())
+                                     self._tokenizer)
 
     def clear(self) -> None:
         self._tokenizer.reset()
-        self._values.clear()
+        del self._values[:]
 
     def crbegin(self) -> 'const_reverse_iterator[Value]':
         return vector.const_reverse_iterator(0, self._values,
-                                             self._tokenizer.create_weak())
+                                             self._tokenizer)
 
     def crend(self) -> 'const_reverse_iterator[Value]':
         return vector.const_reverse_iterator(self.size(), self._values,
-                                             self._tokenizer.create_weak())
+                                             self._tokenizer)
+
+    def data(self) -> memoryview:
+        """
+        Returns view over the storage of typed vector without copying,
+        the vector can not be resized while the view is not released.
+        """
+        if isinstance(self._values, list):
+            raise TypeError('Untyped vectors have no contiguous storage.')
+        return memoryview(self._values)
+
+    def emplace_back(self, value: Value) -> Value:
+        """Appends given value, returns the stored element."""
+        self.push_back(value)
+        return self._values[-1]
 
     def end(self) -> 'iterator[Value]':
         return vector.iterator(self.size(), self._values,
-                               self._tokenizer.create_weak())
+                               self._tokenizer)
+
+    @overload
+    def erase(self, position: const_iterator) -> iterator:
+        """
+        Removes element at given position,
+        returns iterator to the following element.
+        """
+
+    @overload
+    def erase(self, first: const_iterator, last: const_iterator) -> iterator:
+        """
+        Removes elements from range,
+        returns iterator to the element which follows the last removed one.
+        """
+
+    def erase(self, first, last=None):
+        start = self._to_index(first)
+        if last is None:
+            if start == len(self._values):
+                raise RuntimeError('Erasing of stop iterators '
+                                   'is undefined.')
+            stop = start + 1
+        else:
+            stop = self._to_index(last)
+            if start > stop:
+                raise RuntimeError('Erasing of ranges '
+                                   'with start after stop is undefined.')
+        if start != stop:
+            self._tokenizer.reset()
+            del self._values[start:stop]
+        return vector.iterator(start, self._values, self._tokenizer)
+
+    def extend(self, values: Iterable[Value]) -> None:
+        """Appends given values."""
+        values = self._to_storage(values)
+        size = len(self._values) + len(values)
+        if values and size > self._capacity:
+            self._tokenizer.reset()
+            self._capacity = max(2 * len(self._values), size)
+        self._values += values
 
     @overload
     def insert(self,
@@ -383,14 +553,14 @@ class vector(Generic[Value]):
     def insert(self,
                position: const_iterator,
                second_arg,
-               third_arg=None) -> None:
-        index = position._index
-        if third_arg is None:
+               third_arg=_MISSING) -> None:
+        index = self._to_index(position)
+        if third_arg is _MISSING:
             if isinstance(second_arg, abc.Iterable):
-                values = list(second_arg)
+                values = self._to_storage(second_arg)
                 if values:
                     self._tokenizer.reset()
-                self._values[index:index] = second_arg
+                self._values[index:index] = values
             else:
                 self._tokenizer.reset()
                 self._values.insert(index, second_arg)
@@ -400,12 +570,10 @@ class vector(Generic[Value]):
                                  .format(second_arg))
             if second_arg:
                 self._tokenizer.reset()
-            self._values[index:index] = repeat(third_arg, second_arg)
+            self._values[index:index] = self._to_storage(repeat(third_arg,
+                                                                second_arg))
         else:
-            first = _copy(second_arg)
-            values = []
-            while first != third_arg:
-                values.append(first.inc().value)
+            values = self._to_range_storage(second_arg, third_arg)
             if values:
                 self._tokenizer.reset()
             self._values[index:index] = values
@@ -421,21 +589,102 @@ class vector(Generic[Value]):
         return len(self._values)
 
     def push_back(self, value: Value) -> None:
-        self._tokenizer.reset()
-        self._values.append(value)
+        values = self._values
+        if len(values) >= self._capacity:
+            # growth stands for reallocation, so iterators are invalidated
+            self._tokenizer.reset()
+            self._capacity = max(2 * len(values), 1)
+        values.append(value)
 
     def rbegin(self) -> 'reverse_iterator[Value]':
         return vector.reverse_iterator(0, self._values,
-                                       self._tokenizer.create_weak())
+                                       self._tokenizer)
 
     def rend(self) -> 'reverse_iterator[Value]':
         return vector.reverse_iterator(self.size(), self._values,
-                                       self._tokenizer.create_weak())
+                                       self._tokenizer)
+
+    def reserve(self, capacity: int) -> None:
+        if capacity < 0:
+            raise ValueError('Capacity should be positive, but found {}.'
+                             .format(capacity))
+        if capacity > self.capacity():
+            self._tokenizer.reset()
+            self._capacity = capacity
 
     def resize(self, size: int, value: Optional[Value] = None) -> None:
         if size < 0:
             raise ValueError('Size should be positive, but found {}.'
                              .format(size))
+        values = self._values
+        size_change = size - len(values)
+        if not size_change:
+            return
         self._tokenizer.reset()
-        self._values = (self._values
-                        + [value] * (size - len(self._values)))[:size]
+        # storage is changed in place, so iterators keep referring to it
+        if size_change < 0:
+            del values[size:]
+        elif value is None and isinstance(values, array):
+            # like value-initialization of C++ arithmetic types
+            values.frombytes(bytes(values.itemsize * size_change))
+        else:
+            values.extend(repeat(value, size_change))
+
+    def shrink_to_fit(self) -> None:
+        if self._capacity > len(self._values):
+            self._tokenizer.reset()
+            self._capacity = len(self._values)
+
+    def _to_dtype(self) -> Optional[str]:
+        return (None
+                if isinstance(self._values, list)
+                else self._values.typecode)
+
+    def _to_index(self, position: const_iterator) -> int:
+        if not isinstance(position, (vector.const_iterator, vector.iterator)):
+            raise TypeError('Positions should be forward iterators, '
+                            'but found {}.'.format(type(position)))
+        if position._values is not self._values:
+            raise RuntimeError('Using iterators from other collections '
+                               'is undefined.')
+        return position._to_validated_index()
+
+    def _to_range_storage(self,
+                          first: LegacyInputIterator,
+                          last: LegacyInputIterator) -> Storage:
+        if (isinstance(first, _base_vector_iterator)
+                and type(first) is type(last)):
+            # slicing copies the whole range at once
+            return self._to_storage(_to_range_values(first, last))
+        first = _copy(first)
+        values = []
+        while first != last:
+            values.append(first.inc().value)
+        return self._to_storage(values)
+
+    def _to_storage(self, values: Iterable[Value]) -> Storage:
+        # storages are copied on slice assignment,
+        # so the ones of the same kind are used as they are
+        if isinstance(values, vector):
+            values = values._values
+        if isinstance(self._values, list):
+            return values if type(values) is list else list(values)
+        typecode = self._values.typecode
+        return (values
+                if type(values) is array and values.typecode == typecode
+                else array(typecode, values))
+
+
+def _to_range_values(first: _base_vector_iterator,
+                     last: _base_vector_iterator) -> Storage:
+    first._validate_comparison_with(last)
+    start, stop = first._to_validated_index(), last._to_validated_index()
+    if start > stop:
+        raise RuntimeError('Using ranges with start after stop '
+                           'is undefined.')
+    values = first._values
+    if isinstance(first, (vector.const_reverse_iterator,
+                          vector.reverse_iterator)):
+        size = len(values)
+        return values[size - stop:size - start][::-1]
+    return values[start:stop]
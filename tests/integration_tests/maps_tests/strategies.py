@@ -12,16 +12,17 @@ from tests.utils import (BoundPortedMapsPair,
 
 keys = values = strategies.integers()
 empty_lists = strategies.builds(list)
+poolings = strategies.booleans()
 items = strategies.tuples(keys, values)
 items_lists = strategies.lists(items)
 non_empty_items_lists = strategies.lists(items,
                                          min_size=1)
 maps_pairs = strategies.builds(to_bound_ported_maps_pair,
-                               items_lists)
+                               items_lists, poolings)
 empty_maps_pairs = strategies.builds(to_bound_ported_maps_pair,
-                                     empty_lists)
+                                     empty_lists, poolings)
 non_empty_maps_pairs = strategies.builds(to_bound_ported_maps_pair,
-                                         non_empty_items_lists)
+                                         non_empty_items_lists, poolings)
 
 
 def to_non_empty_maps_pairs_with_their_keys(
@@ -10,15 +10,16 @@ from tests.utils import (BoundPortedSetsPair,
 
 objects = strategies.integers()
 empty_lists = strategies.builds(list)
+poolings = strategies.booleans()
 objects_lists = strategies.lists(objects)
 non_empty_objects_lists = strategies.lists(objects,
                                            min_size=1)
 sets_pairs = strategies.builds(to_bound_ported_sets_pair,
-                               objects_lists)
+                               objects_lists, poolings)
 empty_sets_pairs = strategies.builds(to_bound_ported_sets_pair,
-                                     empty_lists)
+                                     empty_lists, poolings)
 non_empty_sets_pairs = strategies.builds(to_bound_ported_sets_pair,
-                                         non_empty_objects_lists)
+                                         non_empty_objects_lists, poolings)
 
 
 def to_non_empty_sets_pairs_with_their_elements(
@@ -0,0 +1,16 @@
+from hypothesis import given
+
+from tests.utils import (BoundPortedVectorsPair,
+                         are_bound_ported_vectors_equal)
+from . import strategies
+
+
+@given(strategies.vectors_pairs, strategies.sizes)
+def test_basic(pair: BoundPortedVectorsPair, capacity: int) -> None:
+    bound, ported = pair
+
+    bound_result, ported_result = (bound.reserve(capacity),
+                                   ported.reserve(capacity))
+
+    assert bound_result is ported_result is None
+    assert are_bound_ported_vectors_equal(bound, ported)
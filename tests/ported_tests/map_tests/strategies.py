@@ -0,0 +1,76 @@
+import operator
+from typing import (List,
+                    Tuple)
+
+from hypothesis import strategies
+
+from cppstd.hints import Item
+from tests.utils import (PortedMap,
+                         Strategy,
+                         pack)
+
+keys = values = strategies.integers()
+items = strategies.tuples(keys, values)
+items_lists = strategies.lists(items)
+
+
+def to_pooled_map(items: List[Item]) -> PortedMap:
+    return PortedMap(*items,
+                     pooled=True)
+
+
+def to_threaded_map(items: List[Item]) -> PortedMap:
+    return PortedMap(*items,
+                     threaded=True)
+
+
+pooled_maps = items_lists.map(to_pooled_map)
+threaded_maps = items_lists.map(to_threaded_map)
+maps = items_lists.map(pack(PortedMap)) | pooled_maps | threaded_maps
+# narrow range of keys makes common ones likely
+dense_keys = strategies.integers(-30, 30)
+dense_keys_lists = strategies.lists(dense_keys)
+dense_items_lists = strategies.lists(strategies.tuples(dense_keys, values))
+dense_maps = (dense_items_lists.map(pack(PortedMap))
+              | dense_items_lists.map(to_pooled_map)
+              | dense_items_lists.map(to_threaded_map))
+non_empty_maps = maps.filter(lambda map: not map.empty())
+
+
+def to_maps_with_indices(map: PortedMap) -> Strategy[Tuple[PortedMap, int]]:
+    return strategies.tuples(strategies.just(map),
+                             strategies.integers(0, map.size() - 1))
+
+
+non_empty_maps_with_indices = non_empty_maps.flatmap(to_maps_with_indices)
+
+
+def to_maps_with_ranges(map: PortedMap
+                        ) -> Strategy[Tuple[PortedMap, int, int]]:
+    size = map.size()
+    return (strategies.integers(0, size)
+            .flatmap(lambda start: strategies.tuples(
+                    strategies.just(map), strategies.just(start),
+                    strategies.integers(start, size))))
+
+
+maps_with_ranges = maps.flatmap(to_maps_with_ranges)
+bounds = strategies.none() | keys
+booleans = strategies.booleans()
+inclusives = strategies.tuples(booleans, booleans)
+key_functions = strategies.sampled_from([abs, operator.neg, str])
+compares = strategies.sampled_from([operator.gt, operator.lt])
+
+
+def to_keyed_maps(items: List[Item]) -> Strategy[PortedMap]:
+    return strategies.sampled_from([PortedMap(*items,
+                                              key=abs),
+                                    PortedMap(*items,
+                                              key=abs,
+                                              pooled=True),
+                                    PortedMap(*items,
+                                              compare=operator.gt,
+                                              threaded=True)])
+
+
+keyed_maps = items_lists.flatmap(to_keyed_maps)
@@ -0,0 +1,18 @@
+import pytest
+from hypothesis import given
+
+from cppstd.hints import Key
+from tests.utils import PortedMap
+from . import strategies
+
+
+@given(strategies.maps, strategies.keys)
+def test_basic(map: PortedMap, key: Key) -> None:
+    items = dict(map.items())
+
+    if key in items:
+        assert map.at(key) == items[key]
+    else:
+        with pytest.raises(KeyError):
+            map.at(key)
+    assert map.items() == sorted(items.items())
@@ -0,0 +1,12 @@
+from hypothesis import given
+
+from cppstd.hints import Key
+from tests.utils import PortedMap
+from . import strategies
+
+
+@given(strategies.maps, strategies.keys)
+def test_basic(map: PortedMap, key: Key) -> None:
+    result = key in map
+
+    assert result is (key in map.keys())
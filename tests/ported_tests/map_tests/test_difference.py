@@ -0,0 +1,53 @@
+import pytest
+from hypothesis import given
+
+from tests.utils import PortedMap
+from . import strategies
+
+
+@given(strategies.dense_maps, strategies.dense_maps)
+def test_basic(map: PortedMap, other: PortedMap) -> None:
+    items, other_items = list(map), list(other)
+    values, other_values = dict(items), dict(other_items)
+    expected_keys = values.keys() - other_values.keys()
+
+    result = map.difference(other)
+
+    assert list(result) == [(key,
+                             values[key]
+                             if key in values
+                             else other_values[key])
+                            for key in sorted(expected_keys)]
+    assert list(map) == items
+    assert list(other) == other_items
+
+
+@given(strategies.dense_maps, strategies.dense_maps)
+def test_in_place(map: PortedMap, other: PortedMap) -> None:
+    expected = map.difference(other)
+    other_items = list(other)
+
+    result = map.difference_update(other)
+
+    assert result is None
+    assert map == expected
+    assert list(other) == other_items
+
+
+@given(strategies.dense_maps, strategies.dense_maps)
+def test_iterators_validity(map: PortedMap, other: PortedMap) -> None:
+    other_keys = frozenset(other.keys())
+    iterators = []
+    iterator = map.begin()
+    while iterator != map.end():
+        iterators.append(iterator.inc())
+    items = [iterator.value for iterator in iterators]
+
+    map.difference_update(other)
+
+    for iterator, item in zip(iterators, items):
+        if item[0] in other_keys:
+            with pytest.raises(RuntimeError):
+                iterator.value
+        else:
+            assert iterator.value == item
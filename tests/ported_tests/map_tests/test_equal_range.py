@@ -0,0 +1,13 @@
+from hypothesis import given
+
+from cppstd.hints import Key
+from tests.utils import PortedMap
+from . import strategies
+
+
+@given(strategies.maps, strategies.keys)
+def test_basic(map: PortedMap, key: Key) -> None:
+    start, stop = map.equal_range(key)
+
+    assert start == map.lower_bound(key)
+    assert stop == map.upper_bound(key)
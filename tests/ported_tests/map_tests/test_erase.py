@@ -0,0 +1,61 @@
+from typing import Tuple
+
+import pytest
+from hypothesis import given
+
+from cppstd.hints import Key
+from cppstd.iterator import advance
+from tests.utils import PortedMap
+from . import strategies
+
+
+@given(strategies.maps, strategies.keys)
+def test_key(map: PortedMap, key: Key) -> None:
+    items = dict(map.items())
+
+    result = map.erase(key)
+
+    assert result == int(key in items)
+    items.pop(key, None)
+    assert map.items() == sorted(items.items())
+
+
+@given(strategies.non_empty_maps_with_indices)
+def test_position(map_with_index: Tuple[PortedMap, int]) -> None:
+    map, index = map_with_index
+    items = map.items()
+    position, last = map.begin(), map.rbegin()
+    advance(position, index)
+
+    result = map.erase(position)
+
+    del items[index]
+    assert map.items() == items
+    assert (result == map.end()
+            if index == len(items)
+            else result.value == items[index])
+    with pytest.raises(RuntimeError):
+        position.value
+    if index < len(items):
+        assert last.value == items[-1]
+
+
+@given(strategies.maps_with_ranges)
+def test_range(map_with_range: Tuple[PortedMap, int, int]) -> None:
+    map, start, stop = map_with_range
+    items = map.items()
+    first, last = map.begin(), map.begin()
+    advance(first, start)
+    advance(last, stop)
+
+    result = map.erase(first, last)
+
+    del items[start:stop]
+    assert map.items() == items
+    assert result == last
+
+
+@given(strategies.non_empty_maps)
+def test_stop(map: PortedMap) -> None:
+    with pytest.raises(RuntimeError):
+        map.erase(map.end())
@@ -0,0 +1,16 @@
+from hypothesis import given
+
+from cppstd.hints import Key
+from tests.utils import PortedMap
+from . import strategies
+
+
+@given(strategies.maps, strategies.keys)
+def test_basic(map: PortedMap, key: Key) -> None:
+    items = dict(map.items())
+
+    result = map.find(key)
+
+    assert (result.value == (key, items[key])
+            if key in items
+            else result == map.end())
@@ -0,0 +1,33 @@
+from typing import List
+
+from hypothesis import given
+
+from cppstd.hints import Item
+from tests.utils import (PortedMap,
+                         item_to_key)
+from . import strategies
+
+
+@given(strategies.items_lists)
+def test_basic(items: List[Item]) -> None:
+    result = PortedMap.from_sorted(items)
+
+    assert result == PortedMap(*items)
+
+
+@given(strategies.items_lists)
+def test_sorted(items: List[Item]) -> None:
+    items = sorted(dict(items).items())
+
+    result = PortedMap.from_sorted(items)
+
+    assert list(result) == items
+
+
+@given(strategies.items_lists)
+def test_pooled(items: List[Item]) -> None:
+    result = PortedMap.from_sorted(sorted(items,
+                                          key=item_to_key),
+                                   pooled=True)
+
+    assert result == PortedMap(*items)
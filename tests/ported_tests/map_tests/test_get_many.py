@@ -0,0 +1,18 @@
+from typing import List
+
+from hypothesis import given
+
+from cppstd.hints import (Key,
+                          Value)
+from tests.utils import PortedMap
+from . import strategies
+
+
+@given(strategies.dense_maps, strategies.dense_keys_lists, strategies.values)
+def test_basic(map: PortedMap, keys: List[Key], default: Value) -> None:
+    items = dict(map.items())
+
+    result = map.get_many(keys, default)
+
+    assert result == [items.get(key, default) for key in keys]
+    assert map.items() == sorted(items.items())
@@ -0,0 +1,15 @@
+from hypothesis import given
+
+from cppstd.hints import Key
+from tests.utils import PortedMap
+from . import strategies
+
+
+@given(strategies.maps, strategies.keys)
+def test_basic(map: PortedMap, key: Key) -> None:
+    items = dict(map.items())
+
+    result = map[key]
+
+    assert result == items.get(key)
+    assert map.keys() == sorted(items.keys() | {key})
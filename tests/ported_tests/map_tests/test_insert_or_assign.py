@@ -0,0 +1,17 @@
+from hypothesis import given
+
+from cppstd.hints import (Key,
+                          Value)
+from tests.utils import PortedMap
+from . import strategies
+
+
+@given(strategies.maps, strategies.keys, strategies.values)
+def test_basic(map: PortedMap, key: Key, value: Value) -> None:
+    items = dict(map.items())
+
+    iterator, inserted = map.insert_or_assign(key, value)
+
+    assert inserted is (key not in items)
+    assert iterator.value == (key, value)
+    assert map.items() == sorted({**items, key: value}.items())
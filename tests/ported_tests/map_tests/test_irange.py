@@ -0,0 +1,25 @@
+from typing import (Any,
+                    Tuple)
+
+from hypothesis import given
+
+from tests.utils import PortedMap
+from . import strategies
+
+
+@given(strategies.maps, strategies.bounds, strategies.bounds,
+       strategies.inclusives, strategies.booleans)
+def test_basic(map: PortedMap,
+               lo: Any,
+               hi: Any,
+               inclusive: Tuple[bool, bool],
+               reverse: bool) -> None:
+    include_lo, include_hi = inclusive
+    expected = [(key, value)
+                for key, value in map
+                if (lo is None or (lo <= key if include_lo else lo < key))
+                and (hi is None or (key <= hi if include_hi else key < hi))]
+
+    result = map.irange(lo, hi, inclusive, reverse)
+
+    assert list(result) == (expected[::-1] if reverse else expected)
@@ -0,0 +1,67 @@
+from typing import (Any,
+                    Callable,
+                    List)
+
+import pytest
+from hypothesis import given
+
+from cppstd.hints import (Item,
+                          Key,
+                          Value)
+from tests.utils import PortedMap
+from . import strategies
+
+
+@given(strategies.items_lists, strategies.key_functions)
+def test_basic(items: List[Item], key: Callable[[Key], Any]) -> None:
+    result = PortedMap(*items,
+                       key=key)
+
+    last_equivalents = {key(item_key): (item_key, value)
+                        for item_key, value in items}
+    assert list(result) == [last_equivalents[item_key]
+                            for item_key in sorted(last_equivalents)]
+
+
+@given(strategies.items_lists, strategies.keys, strategies.values)
+def test_setitem(items: List[Item], key: Key, value: Value) -> None:
+    map = PortedMap(*items,
+                    key=abs)
+    original_key = next((item_key
+                         for item_key, _ in map
+                         if abs(item_key) == abs(key)),
+                        -key)
+
+    map[-key] = value
+
+    assert map.at(key) == value
+    assert original_key in map.keys()
+
+
+@given(strategies.items_lists, strategies.compares)
+def test_compare(items: List[Item],
+                 compare: Callable[[Key, Key], bool]) -> None:
+    result = PortedMap(*items,
+                       compare=compare)
+
+    assert list(result) == sorted(dict(items).items(),
+                                  reverse=compare(1, 0))
+
+
+@given(strategies.items_lists, strategies.compares)
+def test_compare_repr(items: List[Item],
+                      compare: Callable[[Key, Key], bool]) -> None:
+    map_ = PortedMap(*items,
+                     compare=compare)
+
+    result = repr(map_)
+
+    assert result.endswith(', compare={!r})'.format(compare))
+
+
+@given(strategies.items_lists)
+def test_key_with_compare(items: List[Item]) -> None:
+    with pytest.raises(ValueError):
+        PortedMap(*items,
+                  key=abs,
+                  compare=abs)
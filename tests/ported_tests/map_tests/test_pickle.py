@@ -0,0 +1,36 @@
+import pickle
+
+from hypothesis import (given,
+                        strategies as _strategies)
+
+from tests.utils import PortedMap
+from . import strategies
+
+
+@given(strategies.maps,
+       _strategies.integers(0, pickle.HIGHEST_PROTOCOL))
+def test_round_trip(map: PortedMap, protocol: int) -> None:
+    result = pickle.loads(pickle.dumps(map, protocol))
+
+    assert result == map
+    assert repr(result) == repr(map)
+
+
+@given(strategies.maps)
+def test_out_of_band(map: PortedMap) -> None:
+    buffers = []
+
+    result = pickle.loads(pickle.dumps(map, pickle.HIGHEST_PROTOCOL,
+                                       buffer_callback=buffers.append),
+                          buffers=buffers)
+
+    assert result == map
+
+
+@given(strategies.keyed_maps,
+       _strategies.integers(0, pickle.HIGHEST_PROTOCOL))
+def test_keyed(keyed_map: PortedMap, protocol: int) -> None:
+    result = pickle.loads(pickle.dumps(keyed_map, protocol))
+
+    assert result == keyed_map
+    assert repr(result) == repr(keyed_map)
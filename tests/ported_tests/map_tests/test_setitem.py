@@ -0,0 +1,28 @@
+from hypothesis import given
+
+from cppstd.hints import (Key,
+                          Value)
+from tests.utils import PortedMap
+from . import strategies
+
+
+@given(strategies.maps, strategies.keys, strategies.values)
+def test_basic(map: PortedMap, key: Key, value: Value) -> None:
+    items = dict(map.items())
+
+    map[key] = value
+
+    items[key] = value
+    assert list(map) == sorted(items.items())
+
+
+@given(strategies.non_empty_maps, strategies.values)
+def test_overwriting(map: PortedMap, value: Value) -> None:
+    items = list(map)
+    iterator, position = iter(map), map.begin()
+
+    for key, _ in items:
+        map[key] = value
+
+    assert list(iterator) == [(key, value) for key, _ in items]
+    assert position.value == (items[0][0], value)
@@ -0,0 +1,33 @@
+from hypothesis import given
+
+from tests.utils import PortedMap
+from . import strategies
+
+
+@given(strategies.dense_maps, strategies.dense_maps)
+def test_basic(map: PortedMap, other: PortedMap) -> None:
+    items, other_items = list(map), list(other)
+    values, other_values = dict(items), dict(other_items)
+    expected_keys = values.keys() ^ other_values.keys()
+
+    result = map.symmetric_difference(other)
+
+    assert list(result) == [(key,
+                             values[key]
+                             if key in values
+                             else other_values[key])
+                            for key in sorted(expected_keys)]
+    assert list(map) == items
+    assert list(other) == other_items
+
+
+@given(strategies.dense_maps, strategies.dense_maps)
+def test_in_place(map: PortedMap, other: PortedMap) -> None:
+    expected = map.symmetric_difference(other)
+    other_items = list(other)
+
+    result = map.symmetric_difference_update(other)
+
+    assert result is None
+    assert map == expected
+    assert list(other) == other_items
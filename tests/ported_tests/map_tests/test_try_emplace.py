@@ -0,0 +1,17 @@
+from hypothesis import given
+
+from cppstd.hints import (Key,
+                          Value)
+from tests.utils import PortedMap
+from . import strategies
+
+
+@given(strategies.maps, strategies.keys, strategies.values)
+def test_basic(map: PortedMap, key: Key, value: Value) -> None:
+    items = dict(map.items())
+
+    iterator, inserted = map.try_emplace(key, value)
+
+    assert inserted is (key not in items)
+    assert iterator.value == (key, items.get(key, value))
+    assert map.items() == sorted({key: value, **items}.items())
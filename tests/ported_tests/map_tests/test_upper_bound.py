@@ -0,0 +1,16 @@
+from hypothesis import given
+
+from cppstd.hints import Key
+from tests.utils import PortedMap
+from . import strategies
+
+
+@given(strategies.maps, strategies.keys)
+def test_basic(map: PortedMap, key: Key) -> None:
+    items = [item for item in map if key < item[0]]
+
+    result = map.upper_bound(key)
+
+    assert (result.value == items[0]
+            if items
+            else result == map.cend())
@@ -0,0 +1,11 @@
+from hypothesis import given
+
+from tests.utils import PortedMap
+from . import strategies
+
+
+@given(strategies.maps)
+def test_basic(map: PortedMap) -> None:
+    result = map.values()
+
+    assert result == [value for _, value in map]
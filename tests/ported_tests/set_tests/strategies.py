@@ -1,8 +1,92 @@
+import operator
+from typing import (Any,
+                    List,
+                    Tuple)
+
 from hypothesis import strategies
 
 from tests.utils import (PortedSet,
+                         Strategy,
                          pack)
 
 objects = strategies.integers()
 objects_lists = strategies.lists(objects)
-sets = objects_lists.map(pack(PortedSet))
+
+
+def to_pooled_set(values: List[Any]) -> PortedSet:
+    return PortedSet(*values,
+                     pooled=True)
+
+
+def to_threaded_set(values: List[Any]) -> PortedSet:
+    return PortedSet(*values,
+                     threaded=True)
+
+
+pooled_sets = objects_lists.map(to_pooled_set)
+threaded_sets = objects_lists.map(to_threaded_set)
+sets = objects_lists.map(pack(PortedSet)) | pooled_sets | threaded_sets
+# narrow range makes common elements likely
+dense_objects_lists = strategies.lists(strategies.integers(-30, 30))
+dense_sets = (dense_objects_lists.map(pack(PortedSet))
+              | dense_objects_lists.map(to_pooled_set)
+              | dense_objects_lists.map(to_threaded_set))
+large_objects_lists = strategies.lists(objects,
+                                       min_size=100,
+                                       unique=True)
+
+
+def to_sets_with_indices(set: PortedSet) -> Strategy[Tuple[PortedSet, int]]:
+    size = set.size()
+    return strategies.tuples(strategies.just(set),
+                             strategies.integers(-size, size - 1))
+
+
+non_empty_sets = sets.filter(lambda set: not set.empty())
+non_empty_sets_with_indices = non_empty_sets.flatmap(to_sets_with_indices)
+
+
+def to_sets_with_invalid_indices(set: PortedSet
+                                 ) -> Strategy[Tuple[PortedSet, int]]:
+    size = set.size()
+    return strategies.tuples(strategies.just(set),
+                             strategies.integers(max_value=-size - 1)
+                             | strategies.integers(min_value=size))
+
+
+sets_with_invalid_indices = sets.flatmap(to_sets_with_invalid_indices)
+
+
+def to_sets_with_ranges(set: PortedSet
+                        ) -> Strategy[Tuple[PortedSet, int, int]]:
+    size = set.size()
+    return (strategies.integers(0, size)
+            .flatmap(lambda start: strategies.tuples(
+                    strategies.just(set), strategies.just(start),
+                    strategies.integers(start, size))))
+
+
+sets_with_ranges = sets.flatmap(to_sets_with_ranges)
+bounds = strategies.none() | objects
+booleans = strategies.booleans()
+inclusives = strategies.tuples(booleans, booleans)
+key_functions = strategies.sampled_from([abs, operator.neg, str])
+compares = strategies.sampled_from([operator.gt, operator.lt])
+
+
+def to_keyed_sets(values: List[Any]) -> Strategy[PortedSet]:
+    return strategies.sampled_from([PortedSet(*values,
+                                              key=abs),
+                                    PortedSet(*values,
+                                              key=abs,
+                                              pooled=True),
+                                    PortedSet(*values,
+                                              compare=operator.gt,
+                                              threaded=True)])
+
+
+keyed_sets = objects_lists.flatmap(to_keyed_sets)
+set_operations_names = strategies.sampled_from(
+        ['difference', 'difference_update', 'intersection',
+         'intersection_update', 'symmetric_difference',
+         'symmetric_difference_update', 'union', 'update'])
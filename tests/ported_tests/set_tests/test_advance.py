@@ -0,0 +1,42 @@
+from typing import Tuple
+
+import pytest
+from hypothesis import given
+
+from cppstd.iterator import advance
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.non_empty_sets_with_indices)
+def test_basic(set_with_index: Tuple[PortedSet, int]) -> None:
+    set, index = set_with_index
+    offset = index % set.size()
+    iterator = set.begin()
+
+    result = advance(iterator, offset)
+
+    assert result is None
+    assert iterator.value == set.nth(offset)
+
+
+@given(strategies.non_empty_sets_with_indices)
+def test_reversed(set_with_index: Tuple[PortedSet, int]) -> None:
+    set, index = set_with_index
+    offset = index % set.size()
+    iterator = set.rend()
+
+    advance(iterator, -offset - 1)
+
+    assert iterator.value == set.nth(offset)
+
+
+@given(strategies.sets)
+def test_stop(set: PortedSet) -> None:
+    iterator = set.begin()
+
+    advance(iterator, set.size())
+
+    assert iterator == set.end()
+    with pytest.raises(RuntimeError):
+        advance(iterator, 1)
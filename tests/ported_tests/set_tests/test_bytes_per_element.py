@@ -0,0 +1,31 @@
+from typing import (Any,
+                    List)
+
+from hypothesis import given
+
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.sets)
+def test_basic(set: PortedSet) -> None:
+    result = set.bytes_per_element()
+
+    assert isinstance(result, float)
+    assert result > 0
+
+
+@given(strategies.pooled_sets)
+def test_pooled(set: PortedSet) -> None:
+    result = set.bytes_per_element()
+
+    assert isinstance(result, float)
+    assert result > 0
+
+
+@given(strategies.large_objects_lists)
+def test_pooling(objects: List[Any]) -> None:
+    set, pooled_set = PortedSet(*objects), PortedSet(*objects,
+                                                     pooled=True)
+
+    assert pooled_set.bytes_per_element() < set.bytes_per_element()
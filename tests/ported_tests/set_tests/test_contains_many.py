@@ -0,0 +1,14 @@
+from typing import (Any,
+                    List)
+
+from hypothesis import given
+
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.dense_sets, strategies.dense_objects_lists)
+def test_basic(set: PortedSet, values: List[Any]) -> None:
+    result = set.contains_many(values)
+
+    assert result == [value in set for value in values]
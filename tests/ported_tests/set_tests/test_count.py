@@ -0,0 +1,13 @@
+from typing import Any
+
+from hypothesis import given
+
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.sets, strategies.objects)
+def test_basic(set: PortedSet, value: Any) -> None:
+    result = set.count(value)
+
+    assert result == list(set).count(value)
@@ -0,0 +1,27 @@
+from typing import Tuple
+
+from hypothesis import given
+
+from cppstd.iterator import (advance,
+                             distance)
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.sets)
+def test_basic(set: PortedSet) -> None:
+    assert distance(set.begin(), set.end()) == set.size()
+    assert distance(set.rbegin(), set.rend()) == set.size()
+
+
+@given(strategies.non_empty_sets_with_indices)
+def test_connection_with_advance(set_with_index: Tuple[PortedSet, int]
+                                 ) -> None:
+    set, index = set_with_index
+    offset = index % set.size()
+    iterator = set.begin()
+
+    advance(iterator, offset)
+
+    assert distance(set.begin(), iterator) == offset
+    assert distance(iterator, set.begin()) == -offset
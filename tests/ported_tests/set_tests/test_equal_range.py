@@ -0,0 +1,14 @@
+from typing import Any
+
+from hypothesis import given
+
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.sets, strategies.objects)
+def test_basic(set: PortedSet, value: Any) -> None:
+    start, stop = set.equal_range(value)
+
+    assert start == set.lower_bound(value)
+    assert stop == set.upper_bound(value)
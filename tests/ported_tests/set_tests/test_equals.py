@@ -1,3 +1,6 @@
+from typing import (Any,
+                    List)
+
 from hypothesis import given
 
 from tests.utils import (PortedSet,
@@ -22,3 +25,15 @@ def test_transitivity(left_set: PortedSet,
                       right_set: PortedSet) -> None:
     assert implication(left_set == mid_set == right_set,
                        left_set == right_set)
+
+
+@given(strategies.objects_lists)
+def test_pooling(objects: List[Any]) -> None:
+    assert PortedSet(*objects) == PortedSet(*objects,
+                                            pooled=True)
+
+
+@given(strategies.objects_lists)
+def test_threading(objects: List[Any]) -> None:
+    assert PortedSet(*objects) == PortedSet(*objects,
+                                            threaded=True)
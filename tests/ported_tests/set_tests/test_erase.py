@@ -0,0 +1,66 @@
+from typing import (Any,
+                    Tuple)
+
+import pytest
+from hypothesis import given
+
+from cppstd.iterator import advance
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.sets, strategies.objects)
+def test_value(set: PortedSet, value: Any) -> None:
+    elements = list(set)
+
+    result = set.erase(value)
+
+    assert result == elements.count(value)
+    assert list(set) == [element
+                         for element in elements
+                         if element != value]
+
+
+@given(strategies.non_empty_sets_with_indices)
+def test_position(set_with_index: Tuple[PortedSet, int]) -> None:
+    set, index = set_with_index
+    index %= set.size()
+    elements = list(set)
+    position, last = set.begin(), set.rbegin()
+    advance(position, index)
+
+    result = set.erase(position)
+
+    del elements[index]
+    assert list(set) == elements
+    assert (result == set.end()
+            if index == len(elements)
+            else result.value == elements[index])
+    with pytest.raises(RuntimeError):
+        position.value
+    if index < len(elements):
+        assert last.value == elements[-1]
+
+
+@given(strategies.sets_with_ranges)
+def test_range(set_with_range: Tuple[PortedSet, int, int]) -> None:
+    set, start, stop = set_with_range
+    elements = list(set)
+    size = len(elements)
+    first, last, rest = set.begin(), set.begin(), set.rbegin()
+    advance(first, start)
+    advance(last, stop)
+
+    result = set.erase(first, last)
+
+    del elements[start:stop]
+    assert list(set) == elements
+    assert result == last
+    if stop < size:
+        assert rest.value == elements[-1]
+
+
+@given(strategies.non_empty_sets)
+def test_stop(set: PortedSet) -> None:
+    with pytest.raises(RuntimeError):
+        set.erase(set.end())
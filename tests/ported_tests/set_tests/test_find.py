@@ -0,0 +1,17 @@
+from typing import Any
+
+from hypothesis import given
+
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.sets, strategies.objects)
+def test_basic(set: PortedSet, value: Any) -> None:
+    elements = list(set)
+
+    result = set.find(value)
+
+    assert (result.value == value
+            if value in elements
+            else result == set.end())
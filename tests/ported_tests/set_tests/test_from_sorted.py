@@ -0,0 +1,48 @@
+from typing import (Any,
+                    List)
+
+from hypothesis import given
+
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.objects_lists)
+def test_basic(objects: List[Any]) -> None:
+    result = PortedSet.from_sorted(objects)
+
+    assert result == PortedSet(*objects)
+
+
+@given(strategies.objects_lists)
+def test_sorted(objects: List[Any]) -> None:
+    objects = sorted(frozenset(objects))
+
+    result = PortedSet.from_sorted(objects)
+
+    assert list(result) == objects
+
+
+@given(strategies.objects_lists)
+def test_pooled(objects: List[Any]) -> None:
+    result = PortedSet.from_sorted(sorted(objects),
+                                   pooled=True)
+
+    assert result == PortedSet(*objects)
+
+
+@given(strategies.objects_lists)
+def test_compare_without_sorting(objects: List[Any]) -> None:
+    objects = sorted(frozenset(objects))
+    comparisons = []
+
+    def compare(left: Any, right: Any) -> bool:
+        comparisons.append((left, right))
+        return left < right
+
+    result = PortedSet.from_sorted(objects,
+                                   compare=compare)
+
+    assert list(result) == objects
+    # sorting compares values out of order at least once
+    assert all(left < right for left, right in comparisons)
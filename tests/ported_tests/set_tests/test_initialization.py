@@ -1,6 +1,7 @@
 from typing import (Any,
                     List)
 
+import pytest
 from hypothesis import given
 
 from tests.utils import PortedSet
@@ -13,3 +14,11 @@ def test_properties(objects: List[Any]) -> None:
 
     unique_objects = frozenset(objects)
     assert result.size() == len(unique_objects)
+
+
+@given(strategies.objects_lists)
+def test_pooled_threaded(objects: List[Any]) -> None:
+    with pytest.raises(ValueError):
+        PortedSet(*objects,
+                  pooled=True,
+                  threaded=True)
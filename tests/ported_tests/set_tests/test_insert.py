@@ -0,0 +1,70 @@
+from typing import (Any,
+                    List)
+
+from hypothesis import given
+
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.sets, strategies.objects)
+def test_value(set: PortedSet, value: Any) -> None:
+    elements = list(set)
+
+    iterator, inserted = set.insert(value)
+
+    assert inserted is (value not in elements)
+    assert iterator.value == value
+    assert list(set) == sorted(frozenset(elements) | {value})
+
+
+@given(strategies.sets, strategies.objects_lists)
+def test_values(set: PortedSet, values: List[Any]) -> None:
+    elements = list(set)
+
+    result = set.insert(values)
+
+    assert result is None
+    assert list(set) == sorted(frozenset(elements) | frozenset(values))
+
+
+@given(strategies.sets, strategies.sets)
+def test_range(set: PortedSet, other: PortedSet) -> None:
+    elements = list(set)
+
+    result = set.insert(other.begin(), other.end())
+
+    assert result is None
+    assert list(set) == sorted(frozenset(elements) | frozenset(other))
+
+
+@given(strategies.sets, strategies.objects)
+def test_hint(set: PortedSet, value: Any) -> None:
+    elements = list(set)
+
+    result = set.insert(set.end(), value)
+
+    assert result.value == value
+    assert list(set) == sorted(frozenset(elements) | {value})
+
+
+@given(strategies.objects_lists)
+def test_sorted_hints(values: List[Any]) -> None:
+    set = PortedSet()
+
+    for value in sorted(values):
+        set.insert(set.end(), value)
+
+    assert list(set) == sorted(frozenset(values))
+
+
+@given(strategies.non_empty_sets, strategies.objects_lists)
+def test_iterators_validity(set: PortedSet, values: List[Any]) -> None:
+    first, last = set.begin(), set.rbegin()
+    first_value, last_value = first.value, last.value
+
+    for value in values:
+        set.insert(value)
+
+    assert first.value == first_value
+    assert last.value == last_value
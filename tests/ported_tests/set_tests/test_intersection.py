@@ -0,0 +1,48 @@
+import pytest
+from hypothesis import given
+
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.dense_sets, strategies.dense_sets)
+def test_basic(set: PortedSet, other: PortedSet) -> None:
+    elements, other_elements = list(set), list(other)
+
+    result = set.intersection(other)
+
+    assert list(result) == sorted(frozenset(elements)
+                                  & frozenset(other_elements))
+    assert list(set) == elements
+    assert list(other) == other_elements
+
+
+@given(strategies.dense_sets, strategies.dense_sets)
+def test_in_place(set: PortedSet, other: PortedSet) -> None:
+    expected = set.intersection(other)
+    other_elements = list(other)
+
+    result = set.intersection_update(other)
+
+    assert result is None
+    assert set == expected
+    assert list(other) == other_elements
+
+
+@given(strategies.dense_sets, strategies.dense_sets)
+def test_iterators_validity(set: PortedSet, other: PortedSet) -> None:
+    other_elements = frozenset(other)
+    iterators = []
+    iterator = set.begin()
+    while iterator != set.end():
+        iterators.append(iterator.inc())
+    elements = [iterator.value for iterator in iterators]
+
+    set.intersection_update(other)
+
+    for iterator, element in zip(iterators, elements):
+        if element in other_elements:
+            assert iterator.value == element
+        else:
+            with pytest.raises(RuntimeError):
+                iterator.value
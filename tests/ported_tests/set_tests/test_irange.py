@@ -0,0 +1,38 @@
+from typing import (Any,
+                    Tuple)
+
+import pytest
+from hypothesis import given
+
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.sets, strategies.bounds, strategies.bounds,
+       strategies.inclusives, strategies.booleans)
+def test_basic(set: PortedSet,
+               lo: Any,
+               hi: Any,
+               inclusive: Tuple[bool, bool],
+               reverse: bool) -> None:
+    include_lo, include_hi = inclusive
+    expected = [element
+                for element in set
+                if (lo is None
+                    or (lo <= element if include_lo else lo < element))
+                and (hi is None
+                     or (element <= hi if include_hi else element < hi))]
+
+    result = set.irange(lo, hi, inclusive, reverse)
+
+    assert list(result) == (expected[::-1] if reverse else expected)
+
+
+@given(strategies.non_empty_sets)
+def test_invalidation(set: PortedSet) -> None:
+    iterator = set.irange()
+
+    set.clear()
+
+    with pytest.raises(RuntimeError):
+        next(iterator)
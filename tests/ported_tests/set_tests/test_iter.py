@@ -0,0 +1,23 @@
+import pytest
+from hypothesis import given
+
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.sets)
+def test_basic(set: PortedSet) -> None:
+    result = list(set)
+
+    assert result == sorted(frozenset(result))
+    assert len(result) == set.size()
+
+
+@given(strategies.non_empty_sets)
+def test_invalidation(set: PortedSet) -> None:
+    iterator = iter(set)
+
+    set.clear()
+
+    with pytest.raises(RuntimeError):
+        next(iterator)
@@ -0,0 +1,71 @@
+from typing import (Any,
+                    Callable,
+                    List)
+
+import pytest
+from hypothesis import given
+
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.objects_lists, strategies.key_functions)
+def test_basic(objects: List[Any], key: Callable[[Any], Any]) -> None:
+    result = PortedSet(*objects,
+                       key=key)
+
+    first_equivalents = {}
+    for object_ in objects:
+        first_equivalents.setdefault(key(object_), object_)
+    assert list(result) == [first_equivalents[object_key]
+                            for object_key in sorted(first_equivalents)]
+
+
+@given(strategies.objects_lists, strategies.objects)
+def test_equivalents(objects: List[Any], object_: Any) -> None:
+    set = PortedSet(*objects,
+                    key=abs)
+
+    assert (object_ in set) is (-object_ in set)
+    assert set.rank(object_) == set.rank(-object_)
+    assert set.find(object_) == set.find(-object_)
+
+
+@given(strategies.objects_lists, strategies.compares)
+def test_compare(objects: List[Any],
+                 compare: Callable[[Any, Any], bool]) -> None:
+    result = PortedSet(*objects,
+                       compare=compare)
+
+    assert list(result) == sorted(frozenset(objects),
+                                  reverse=compare(1, 0))
+
+
+@given(strategies.objects_lists, strategies.compares)
+def test_compare_repr(objects: List[Any],
+                      compare: Callable[[Any, Any], bool]) -> None:
+    set = PortedSet(*objects,
+                    compare=compare)
+
+    result = repr(set)
+
+    assert result.endswith(', compare={!r})'.format(compare))
+
+
+@given(strategies.objects_lists, strategies.objects_lists)
+def test_insert(objects: List[Any], other_objects: List[Any]) -> None:
+    set = PortedSet(*objects,
+                    key=abs)
+
+    set.insert(other_objects)
+
+    assert list(set) == list(PortedSet(*objects, *other_objects,
+                                       key=abs))
+
+
+@given(strategies.objects_lists)
+def test_key_with_compare(objects: List[Any]) -> None:
+    with pytest.raises(ValueError):
+        PortedSet(*objects,
+                  key=abs,
+                  compare=abs)
@@ -0,0 +1,17 @@
+from typing import Any
+
+from hypothesis import given
+
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.sets, strategies.objects)
+def test_basic(set: PortedSet, value: Any) -> None:
+    elements = [element for element in set if not element < value]
+
+    result = set.lower_bound(value)
+
+    assert (result.value == elements[0]
+            if elements
+            else result == set.cend())
@@ -0,0 +1,33 @@
+from typing import Tuple
+
+import pytest
+from hypothesis import given
+
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.non_empty_sets_with_indices)
+def test_basic(set_with_index: Tuple[PortedSet, int]) -> None:
+    set, index = set_with_index
+
+    result = set.nth(index)
+
+    assert result == list(set)[index]
+
+
+@given(strategies.non_empty_sets_with_indices)
+def test_connection_with_rank(set_with_index: Tuple[PortedSet, int]) -> None:
+    set, index = set_with_index
+
+    result = set.nth(index)
+
+    assert set.rank(result) == index % set.size()
+
+
+@given(strategies.sets_with_invalid_indices)
+def test_invalid_index(set_with_index: Tuple[PortedSet, int]) -> None:
+    set, index = set_with_index
+
+    with pytest.raises(IndexError):
+        set.nth(index)
@@ -0,0 +1,36 @@
+import pickle
+
+from hypothesis import (given,
+                        strategies as _strategies)
+
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.sets,
+       _strategies.integers(0, pickle.HIGHEST_PROTOCOL))
+def test_round_trip(set: PortedSet, protocol: int) -> None:
+    result = pickle.loads(pickle.dumps(set, protocol))
+
+    assert result == set
+    assert repr(result) == repr(set)
+
+
+@given(strategies.sets)
+def test_out_of_band(set: PortedSet) -> None:
+    buffers = []
+
+    result = pickle.loads(pickle.dumps(set, pickle.HIGHEST_PROTOCOL,
+                                       buffer_callback=buffers.append),
+                          buffers=buffers)
+
+    assert result == set
+
+
+@given(strategies.keyed_sets,
+       _strategies.integers(0, pickle.HIGHEST_PROTOCOL))
+def test_keyed(keyed_set: PortedSet, protocol: int) -> None:
+    result = pickle.loads(pickle.dumps(keyed_set, protocol))
+
+    assert result == keyed_set
+    assert repr(result) == repr(keyed_set)
@@ -0,0 +1,18 @@
+from typing import Any
+
+from hypothesis import given
+
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.sets, strategies.objects)
+def test_basic(set: PortedSet, value: Any) -> None:
+    result = set.rank(value)
+
+    assert result == sum(element < value for element in set)
+
+
+@given(strategies.sets)
+def test_elements(set: PortedSet) -> None:
+    assert [set.rank(element) for element in set] == list(range(set.size()))
@@ -0,0 +1,40 @@
+import gc
+from typing import Tuple
+
+from hypothesis import given
+
+from cppstd.iterator import advance
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.dense_sets, strategies.dense_sets,
+       strategies.set_operations_names)
+def test_set_operations(set: PortedSet,
+                        other: PortedSet,
+                        operation_name: str) -> None:
+    gc.collect()
+    gc.disable()
+    try:
+        result = getattr(set, operation_name)(other)
+        del result
+
+        assert not gc.collect()
+    finally:
+        gc.enable()
+
+
+@given(strategies.sets_with_ranges)
+def test_erase(set_with_range: Tuple[PortedSet, int, int]) -> None:
+    set, start, stop = set_with_range
+    first, last = set.begin(), set.begin()
+    advance(first, start)
+    advance(last, stop)
+    gc.collect()
+    gc.disable()
+    try:
+        set.erase(first, last)
+
+        assert not gc.collect()
+    finally:
+        gc.enable()
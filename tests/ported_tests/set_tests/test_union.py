@@ -0,0 +1,28 @@
+from hypothesis import given
+
+from tests.utils import PortedSet
+from . import strategies
+
+
+@given(strategies.dense_sets, strategies.dense_sets)
+def test_basic(set: PortedSet, other: PortedSet) -> None:
+    elements, other_elements = list(set), list(other)
+
+    result = set.union(other)
+
+    assert list(result) == sorted(frozenset(elements)
+                                  | frozenset(other_elements))
+    assert list(set) == elements
+    assert list(other) == other_elements
+
+
+@given(strategies.dense_sets, strategies.dense_sets)
+def test_in_place(set: PortedSet, other: PortedSet) -> None:
+    expected = set.union(other)
+    other_elements = list(other)
+
+    result = set.update(other)
+
+    assert result is None
+    assert set == expected
+    assert list(other) == other_elements
@@ -1,3 +1,5 @@
+from typing import List
+
 from hypothesis import strategies
 
 from tests.utils import (PortedVector,
@@ -6,3 +8,24 @@ from tests.utils import (PortedVector,
 objects = strategies.integers()
 objects_lists = strategies.lists(objects)
 vectors = objects_lists.map(pack(PortedVector))
+non_empty_vectors = vectors.filter(lambda vector: not vector.empty())
+machine_integers_lists = strategies.lists(strategies.integers(-2 ** 63,
+                                                              2 ** 63 - 1))
+floats_lists = strategies.lists(strategies.floats(allow_nan=False))
+
+
+def to_integers_vector(values: List[int]) -> PortedVector:
+    return PortedVector(*values,
+                        dtype='q')
+
+
+def to_floats_vector(values: List[float]) -> PortedVector:
+    return PortedVector(*values,
+                        dtype='d')
+
+
+typed_vectors = (machine_integers_lists.map(to_integers_vector)
+                 | floats_lists.map(to_floats_vector))
+non_empty_typed_vectors = typed_vectors.filter(
+        lambda vector: not vector.empty())
+sizes = strategies.integers(0, 100)
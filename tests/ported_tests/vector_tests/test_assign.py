@@ -0,0 +1,44 @@
+from typing import (Any,
+                    List)
+
+from hypothesis import given
+
+from tests.utils import PortedVector
+from . import strategies
+
+
+@given(strategies.vectors, strategies.sizes, strategies.objects)
+def test_count(vector: PortedVector, count: int, value: Any) -> None:
+    vector.assign(count, value)
+
+    assert list(vector) == [value] * count
+
+
+@given(strategies.vectors, strategies.vectors)
+def test_range(vector: PortedVector, other: PortedVector) -> None:
+    vector.assign(other.begin(), other.end())
+
+    assert vector == other
+
+
+@given(strategies.vectors | strategies.typed_vectors)
+def test_self_reverse_range(vector: PortedVector) -> None:
+    original = list(vector)
+
+    vector.assign(vector.rbegin(), vector.rend())
+
+    assert list(vector) == original[::-1]
+
+
+@given(strategies.vectors, strategies.objects_lists)
+def test_generator(vector: PortedVector, objects: List[Any]) -> None:
+    vector.assign(object_ for object_ in objects)
+
+    assert list(vector) == objects
+
+
+@given(strategies.vectors, strategies.sizes)
+def test_count_none(vector: PortedVector, count: int) -> None:
+    vector.assign(count, None)
+
+    assert list(vector) == [None] * count
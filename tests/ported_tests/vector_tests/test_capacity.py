@@ -0,0 +1,60 @@
+from typing import Any
+
+import pytest
+from hypothesis import given
+
+from tests.utils import PortedVector
+from . import strategies
+
+
+@given(strategies.vectors | strategies.typed_vectors)
+def test_basic(vector: PortedVector) -> None:
+    result = vector.capacity()
+
+    assert result >= vector.size()
+
+
+@given(strategies.vectors, strategies.sizes)
+def test_reserve(vector: PortedVector, capacity: int) -> None:
+    vector.reserve(capacity)
+
+    assert vector.capacity() >= capacity
+
+
+@given(strategies.non_empty_vectors, strategies.sizes, strategies.objects)
+def test_push_back_within(vector: PortedVector,
+                          extra_size: int,
+                          value: Any) -> None:
+    vector.reserve(vector.size() + extra_size)
+    iterator = vector.begin()
+
+    for _ in range(extra_size):
+        vector.push_back(value)
+
+    assert iterator == vector.begin()
+
+
+@given(strategies.vectors, strategies.objects)
+def test_push_back_within_stop(vector: PortedVector, value: Any) -> None:
+    vector.reserve(vector.size() + 1)
+    iterator = vector.end()
+
+    vector.push_back(value)
+
+    with pytest.raises(RuntimeError):
+        iterator.value
+
+
+@given(strategies.non_empty_vectors, strategies.sizes, strategies.objects)
+def test_push_back_within_reversed(vector: PortedVector,
+                                   extra_size: int,
+                                   value: Any) -> None:
+    vector.reserve(vector.size() + extra_size)
+    iterator = vector.rend()
+    first_value = vector[0]
+
+    for _ in range(extra_size):
+        vector.push_back(value)
+
+    assert iterator == vector.rend()
+    assert (iterator - 1).value == first_value
@@ -0,0 +1,28 @@
+import pytest
+from hypothesis import given
+
+from tests.utils import PortedVector
+from . import strategies
+
+
+@given(strategies.typed_vectors)
+def test_basic(vector: PortedVector) -> None:
+    result = vector.data()
+
+    assert isinstance(result, memoryview)
+    assert result.tolist() == list(vector)
+
+
+@given(strategies.non_empty_typed_vectors)
+def test_zero_copy(vector: PortedVector) -> None:
+    view = vector.data()
+
+    view[0] = view[-1]
+
+    assert vector[0] == vector[-1]
+
+
+@given(strategies.vectors)
+def test_untyped(vector: PortedVector) -> None:
+    with pytest.raises(TypeError):
+        vector.data()
@@ -0,0 +1,14 @@
+from hypothesis import given
+
+from tests.utils import PortedVector
+from . import strategies
+
+
+@given(strategies.typed_vectors)
+def test_typed(vector: PortedVector) -> None:
+    original = list(vector)
+
+    result = vector.emplace_back(1)
+
+    assert result == vector[-1] == 1
+    assert list(vector) == original + [1]
@@ -1,3 +1,5 @@
+from typing import List
+
 from hypothesis import given
 
 from tests.utils import (PortedVector,
@@ -24,3 +26,13 @@ def test_transitivity(left_vector: PortedVector,
                       right_vector: PortedVector) -> None:
     assert implication(left_vector == mid_vector == right_vector,
                        left_vector == right_vector)
+
+
+@given(strategies.machine_integers_lists, strategies.machine_integers_lists)
+def test_mixed_storages(left_values: List[int],
+                        right_values: List[int]) -> None:
+    left_vector = PortedVector(*left_values)
+    right_vector = strategies.to_integers_vector(right_values)
+
+    assert (left_vector == right_vector) is (left_values == right_values)
+    assert (right_vector == left_vector) is (left_values == right_values)
@@ -0,0 +1,47 @@
+import pytest
+from hypothesis import given
+
+from tests.utils import PortedVector
+from . import strategies
+
+
+@given(strategies.vectors | strategies.typed_vectors, strategies.sizes)
+def test_position(vector: PortedVector, index: int) -> None:
+    original = list(vector)
+    index = min(index, max(len(original) - 1, 0))
+
+    if original:
+        result = vector.erase(vector.begin() + index)
+
+        assert list(vector) == original[:index] + original[index + 1:]
+        assert result == vector.begin() + index
+    else:
+        with pytest.raises(RuntimeError):
+            vector.erase(vector.begin())
+
+
+@given(strategies.vectors | strategies.typed_vectors, strategies.sizes,
+       strategies.sizes)
+def test_range(vector: PortedVector, start: int, stop: int) -> None:
+    original = list(vector)
+    start, stop = sorted([min(start, len(original)), min(stop, len(original))])
+
+    result = vector.erase(vector.begin() + start, vector.begin() + stop)
+
+    assert list(vector) == original[:start] + original[stop:]
+    assert result == vector.begin() + start
+
+
+@given(strategies.vectors)
+def test_empty_range(vector: PortedVector) -> None:
+    iterator = vector.begin()
+
+    vector.erase(vector.end(), vector.end())
+
+    assert iterator == vector.begin()
+
+
+@given(strategies.vectors, strategies.vectors)
+def test_other_collection(vector: PortedVector, other: PortedVector) -> None:
+    with pytest.raises(RuntimeError):
+        vector.erase(other.begin(), other.end())
@@ -0,0 +1,38 @@
+from typing import (Any,
+                    List)
+
+from hypothesis import given
+
+from tests.utils import PortedVector
+from . import strategies
+
+
+@given(strategies.vectors, strategies.objects_lists)
+def test_basic(vector: PortedVector, objects: List[Any]) -> None:
+    original = list(vector)
+
+    vector.extend(objects)
+
+    assert list(vector) == original + objects
+
+
+@given(strategies.vectors | strategies.typed_vectors)
+def test_self(vector: PortedVector) -> None:
+    original = list(vector)
+
+    vector.extend(vector)
+
+    assert list(vector) == original + original
+
+
+@given(strategies.non_empty_vectors, strategies.sizes,
+       strategies.objects_lists)
+def test_within_capacity(vector: PortedVector,
+                         extra_size: int,
+                         objects: List[Any]) -> None:
+    vector.reserve(vector.size() + len(objects) + extra_size)
+    iterator = vector.begin()
+
+    vector.extend(objects)
+
+    assert iterator == vector.begin()
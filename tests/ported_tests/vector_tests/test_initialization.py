@@ -12,3 +12,12 @@ def test_properties(objects: List[Any]) -> None:
     result = PortedVector(*objects)
 
     assert result.size() == len(objects)
+
+
+@given(strategies.machine_integers_lists)
+def test_typed(objects: List[int]) -> None:
+    result = PortedVector(*objects,
+                          dtype='q')
+
+    assert result.size() == len(objects)
+    assert list(result) == objects
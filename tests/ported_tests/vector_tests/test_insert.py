@@ -0,0 +1,71 @@
+from typing import (Any,
+                    List)
+
+import pytest
+from hypothesis import given
+
+from tests.utils import PortedVector
+from . import strategies
+
+
+@given(strategies.vectors, strategies.objects_lists)
+def test_generator(vector: PortedVector, objects: List[Any]) -> None:
+    original = list(vector)
+
+    vector.insert(vector.begin(), (object_ for object_ in objects))
+
+    assert list(vector) == objects + original
+
+
+@given(strategies.vectors, strategies.vectors)
+def test_vector_range(vector: PortedVector, other: PortedVector) -> None:
+    original, other_values = list(vector), list(other)
+
+    vector.insert(vector.end(), other.begin(), other.end())
+
+    assert list(vector) == original + other_values
+
+
+@given(strategies.vectors, strategies.vectors)
+def test_vector_reverse_range(vector: PortedVector,
+                              other: PortedVector) -> None:
+    original, other_values = list(vector), list(other)
+
+    vector.insert(vector.begin(), other.rbegin(), other.rend())
+
+    assert list(vector) == other_values[::-1] + original
+
+
+@given(strategies.vectors | strategies.typed_vectors)
+def test_self_range(vector: PortedVector) -> None:
+    original = list(vector)
+
+    vector.insert(vector.end(), vector.begin(), vector.end())
+
+    assert list(vector) == original + original
+
+
+@given(strategies.vectors, strategies.sizes)
+def test_count_none(vector: PortedVector, count: int) -> None:
+    original = list(vector)
+
+    vector.insert(vector.end(), count, None)
+
+    assert list(vector) == original + [None] * count
+
+
+@given(strategies.vectors, strategies.vectors, strategies.objects)
+def test_other_collection(vector: PortedVector,
+                          other: PortedVector,
+                          value: Any) -> None:
+    with pytest.raises(RuntimeError):
+        vector.insert(other.begin(), value)
+
+
+@given(strategies.vectors, strategies.objects)
+def test_invalidated_position(vector: PortedVector, value: Any) -> None:
+    position = vector.begin()
+    vector.insert(position, value)
+
+    with pytest.raises(RuntimeError):
+        vector.insert(position, value)
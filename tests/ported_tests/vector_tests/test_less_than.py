@@ -0,0 +1,32 @@
+from typing import List
+
+from hypothesis import given
+
+from tests.utils import (PortedVector,
+                         implication)
+from . import strategies
+
+
+@given(strategies.vectors)
+def test_irreflexivity(vector: PortedVector) -> None:
+    assert not vector < vector
+    assert vector <= vector
+
+
+@given(strategies.vectors, strategies.vectors)
+def test_asymmetry(left_vector: PortedVector,
+                   right_vector: PortedVector) -> None:
+    assert implication(left_vector < right_vector,
+                       not right_vector < left_vector)
+
+
+@given(strategies.machine_integers_lists, strategies.machine_integers_lists)
+def test_mixed_storages(left_values: List[int],
+                        right_values: List[int]) -> None:
+    left_vector = PortedVector(*left_values)
+    right_vector = strategies.to_integers_vector(right_values)
+
+    assert (left_vector < right_vector) is (left_values < right_values)
+    assert (left_vector <= right_vector) is (left_values <= right_values)
+    assert (right_vector < left_vector) is (right_values < left_values)
+    assert (right_vector <= left_vector) is (right_values <= left_values)
@@ -0,0 +1,28 @@
+import pickle
+
+from hypothesis import (given,
+                        strategies as _strategies)
+
+from tests.utils import PortedVector
+from . import strategies
+
+
+@given(strategies.vectors | strategies.typed_vectors,
+       _strategies.integers(0, pickle.HIGHEST_PROTOCOL))
+def test_round_trip(vector: PortedVector, protocol: int) -> None:
+    result = pickle.loads(pickle.dumps(vector, protocol))
+
+    assert result == vector
+    assert repr(result) == repr(vector)
+
+
+@given(strategies.typed_vectors)
+def test_out_of_band(vector: PortedVector) -> None:
+    buffers = []
+
+    result = pickle.loads(pickle.dumps(vector, pickle.HIGHEST_PROTOCOL,
+                                       buffer_callback=buffers.append),
+                          buffers=buffers)
+
+    assert result == vector
+    assert buffers
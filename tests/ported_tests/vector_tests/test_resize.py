@@ -0,0 +1,23 @@
+from hypothesis import given
+
+from tests.utils import PortedVector
+from . import strategies
+
+
+@given(strategies.typed_vectors, strategies.sizes)
+def test_typed_defaults(vector: PortedVector, size: int) -> None:
+    original = list(vector)
+
+    vector.resize(size)
+
+    assert vector.size() == size
+    assert list(vector) == (original + [0] * size)[:size]
+
+
+@given(strategies.vectors | strategies.typed_vectors)
+def test_same_size(vector: PortedVector) -> None:
+    iterator = vector.begin()
+
+    vector.resize(vector.size())
+
+    assert iterator == vector.begin()
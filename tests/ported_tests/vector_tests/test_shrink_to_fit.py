@@ -0,0 +1,14 @@
+from hypothesis import given
+
+from tests.utils import PortedVector
+from . import strategies
+
+
+@given(strategies.vectors, strategies.sizes)
+def test_basic(vector: PortedVector, capacity: int) -> None:
+    vector.reserve(capacity)
+
+    result = vector.shrink_to_fit()
+
+    assert result is None
+    assert vector.capacity() == vector.size()
@@ -162,12 +162,16 @@ def iterate_cpp_iterator(start: Domain, stop: Domain) -> Iterator[Domain]:
         yield start.inc()
 
 
-def to_bound_ported_maps_pair(items: List[Item]) -> BoundPortedMapsPair:
-    return BoundMap(*items), PortedMap(*items)
+def to_bound_ported_maps_pair(items: List[Item],
+                              pooled: bool = False) -> BoundPortedMapsPair:
+    return BoundMap(*items), PortedMap(*items,
+                                       pooled=pooled)
 
 
-def to_bound_ported_sets_pair(values: List[Value]) -> BoundPortedSetsPair:
-    return BoundSet(*values), PortedSet(*values)
+def to_bound_ported_sets_pair(values: List[Value],
+                              pooled: bool = False) -> BoundPortedSetsPair:
+    return BoundSet(*values), PortedSet(*values,
+                                        pooled=pooled)
 
 
 def to_bound_ported_vectors_pair(values: List[Value]